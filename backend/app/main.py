@@ -1,6 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import os
+import sys
 from app.middleware.error_handler import setup_error_handler
 from app.middleware.request_logger import setup_request_logger
 from app.middleware.rate_limiter import setup_rate_limiter
@@ -16,14 +18,20 @@ app = FastAPI(
     description="API for Order Management SaaS",
     version=settings.API_VERSION,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
-# Setup middleware in the correct order (important!)
-# 1. Request logger should be first to capture all requests
+# Setup middleware in the correct order (important!). Each one added wraps
+# the ones before it.
+# 1. Exception handlers, and the unhandled error catch as the innermost
+# middleware, so 500s still get request ID and CORS headers
+setup_error_handler(app)
+
+# 2. Request logger, so every request, including failed ones, is logged and tagged
 setup_request_logger(app)
 
-# 2. Rate limiter middleware
+# 3. Rate limiter middleware
 setup_rate_limiter(
     app,
     rate_limit=settings.RATE_LIMIT_MAX_REQUESTS,
@@ -31,33 +39,49 @@ setup_rate_limiter(
     exempt_paths=["/health", "/docs", "/openapi.json", "/redoc"]
 )
 
-# 3. CORS middleware
-origins = [
-    "http://localhost:5173",  # Vite default
-    "http://localhost:5174",
-    "http://localhost:5175",
-    settings.FRONTEND_URL
-]
+# 4. CORS middleware
+# Frozen set of allowed origins for O(1) membership checks
+origins = frozenset(
+    origin for origin in (
+        "http://localhost:5173",  # Vite default
+        "http://localhost:5174",
+        "http://localhost:5175",
+        settings.FRONTEND_URL
+    )
+    if origin  # Filter out empty strings
+)
+
+if settings.ENVIRONMENT == "production":
+    # List only what the frontend actually uses so preflights are checked
+    # against a fixed set instead of echoing arbitrary requested values
+    cors_methods = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+    cors_headers = ["Authorization", "Content-Type"]
+else:
+    cors_methods = ["*"]
+    cors_headers = ["*"]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[origin for origin in origins if origin],  # Filter out empty strings
+    allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=cors_methods,
+    allow_headers=cors_headers,
+    # Response headers the frontend reads: the next-page cursor, ETags for
+    # conditional requests, and the report cache status
+    expose_headers=["X-Next-Cursor", "ETag", "X-Cache"],
 )
 
-# 4. Error handling middleware should be last to catch all exceptions
-setup_error_handler(app)
+# Static payload for the root endpoint
+ROOT_PAYLOAD = {
+    "message": "Welcome to the Order Management API",
+    "docs": "/docs",
+    "api": "/api"
+}
 
 # Root endpoint redirects to docs
 @app.get("/")
 async def root():
-    return {
-        "message": "Welcome to the Order Management API",
-        "docs": "/docs",
-        "api": "/api"
-    }
+    return ROOT_PAYLOAD
 
 # Setup routes using the centralized router organization
 setup_routes(app)
@@ -67,5 +91,16 @@ logger.info(f"Application startup complete in {settings.ENVIRONMENT} environment
 if __name__ == "__main__":
     import uvicorn
     port = settings.API_PORT
-    logger.info(f"Starting server on port {port}")
-    uvicorn.run("app.main:app", host=settings.API_HOST, port=port, reload=True) 
\ No newline at end of file
+    # Auto-reload only works with a single worker
+    reload = settings.ENVIRONMENT == "development"
+    workers = 1 if reload else settings.WEB_CONCURRENCY
+    logger.info(f"Starting server on port {port} with {workers} worker(s)")
+    uvicorn.run(
+        "app.main:app",
+        host=settings.API_HOST,
+        port=port,
+        reload=reload,
+        workers=workers,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools"
+    ) 
\ No newline at end of file
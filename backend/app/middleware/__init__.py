@@ -3,7 +3,7 @@ Middleware package initialization.
 This module contains middleware components for the FastAPI application.
 """
 
-from app.middleware.error_handler import setup_error_handlers
+from app.middleware.error_handler import setup_error_handler
 from app.middleware.auth import (
     get_current_user,
     require_permission,
@@ -15,7 +15,7 @@ from app.middleware.auth import (
 )
 
 __all__ = [
-    'setup_error_handlers',
+    'setup_error_handler',
     'get_current_user',
     'require_permission',
     'require_any_permission',
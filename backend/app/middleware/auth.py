@@ -2,14 +2,40 @@ from fastapi import Request, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from starlette.status import HTTP_403_FORBIDDEN, HTTP_401_UNAUTHORIZED
 from typing import List, Optional, Dict, Any, Callable
-from functools import wraps
+from functools import wraps, lru_cache
+import hashlib
+import time
 import jwt
+from uuid import UUID
 from app.utils.config import settings
 from app.utils.logging import setup_logger
+from app.utils.cache import TTLCache
 
 logger = setup_logger(__name__)
 security = HTTPBearer()
 
+# Cache of verified token payloads keyed by token hash.
+# Entries never outlive the token's own expiry and failed decodes are never cached.
+TOKEN_CACHE_TTL_SECONDS = 30
+_token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+# Cache of resolved current-user dicts, keyed and bounded the same way.
+# Cached dicts are shared between requests and must be treated as read-only.
+_user_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+# Negative cache of rejected token hashes mapped to the rejection reason, so
+# repeated requests with the same bad token skip jwt.decode entirely
+REJECTED_TOKEN_CACHE_TTL_SECONDS = 3600
+_rejected_token_cache = TTLCache(maxsize=10000, ttl=REJECTED_TOKEN_CACHE_TTL_SECONDS)
+
+# JWT decode arguments, built once at import
+_JWT_KEY = settings.JWT_SECRET
+_JWT_ALGS = (settings.JWT_ALGORITHM,)
+_JWT_OPTS = {"require": ["exp", "sub"]}
+
+# Roles allowed to act on any customer's orders
+STAFF_ROLES = frozenset({"admin", "staff"})
+
 # Define role hierarchy (higher number = higher access)
 ROLE_HIERARCHY = {
     'admin': 3,
@@ -17,9 +43,17 @@ ROLE_HIERARCHY = {
     'staff': 1
 }
 
-# Define permissions for each role
+# Precomputed (user_role, required_role) pairs where user_role meets required_role
+ROLE_GE = frozenset(
+    (user_role, required_role)
+    for user_role, user_level in ROLE_HIERARCHY.items()
+    for required_role, required_level in ROLE_HIERARCHY.items()
+    if user_level >= required_level
+)
+
+# Define permissions for each role (frozensets for constant-time membership checks)
 ROLE_PERMISSIONS = {
-    'admin': [
+    'admin': frozenset({
         'create:users',
         'read:users',
         'update:users',
@@ -35,8 +69,8 @@ ROLE_PERMISSIONS = {
         'read:statistics',
         'manage:forms',
         'manage:settings'
-    ],
-    'producer': [
+    }),
+    'producer': frozenset({
         'create:products',
         'read:products',
         'update:products',
@@ -46,58 +80,111 @@ ROLE_PERMISSIONS = {
         'read:statistics',
         'manage:forms',
         'manage:settings'
-    ],
-    'staff': [
+    }),
+    'staff': frozenset({
         'read:products',
         'read:orders',
         'update:orders'
-    ]
+    })
 }
 
+_NO_PERMISSIONS = frozenset()
+
+def _token_cache_key(token: str) -> bytes:
+    """
+    Build the cache key for a bearer token.
+    """
+    return hashlib.sha256(token.encode()).digest()
+
+def _token_time_remaining(payload: Dict[str, Any]) -> float:
+    """
+    Seconds until the token expires, or 0 if it has no expiry.
+    """
+    exp = payload.get("exp")
+    return exp - time.time() if exp is not None else 0
+
 async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
     """
     Verify JWT token and return the payload.
+    Verified payloads are cached briefly and rejected tokens are remembered,
+    so repeated requests with the same bearer token skip signature verification.
     """
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token, 
-            settings.JWT_SECRET_KEY, 
-            algorithms=[settings.JWT_ALGORITHM]
-        )
+    token = credentials.credentials
+    cache_key = _token_cache_key(token)
+    payload = _token_cache.get(cache_key)
+    if payload is not None:
         return payload
+    
+    # Check if this token was already rejected
+    rejection = _rejected_token_cache.get(cache_key)
+    if rejection is not None:
+        raise HTTPException(
+            status_code=HTTP_401_UNAUTHORIZED,
+            detail=rejection
+        )
+    
+    try:
+        payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGS, options=_JWT_OPTS)
     except jwt.ExpiredSignatureError:
         logger.warning("Token has expired")
+        _rejected_token_cache.set(cache_key, "Token has expired")
         raise HTTPException(
             status_code=HTTP_401_UNAUTHORIZED,
             detail="Token has expired"
         )
-    except jwt.InvalidTokenError:
+    except jwt.InvalidTokenError as e:
         logger.warning("Invalid token")
+        # Not-yet-valid tokens may become valid, so don't remember them
+        if not isinstance(e, jwt.ImmatureSignatureError):
+            _rejected_token_cache.set(cache_key, "Invalid token")
         raise HTTPException(
             status_code=HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
+    
+    remaining = _token_time_remaining(payload)
+    if remaining > 0:
+        _token_cache.set(cache_key, payload, ttl=remaining)
+    
+    return payload
 
-async def get_current_user(payload: Dict[str, Any] = Depends(verify_token)) -> Dict[str, Any]:
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
     """
     Get the current user from the JWT payload.
+    The resolved user is cached per token, so repeat requests resolve to a
+    single cache lookup.
     """
-    user_id = payload.get("sub")
-    if not user_id:
-        logger.warning("User ID not found in token")
+    cache_key = _token_cache_key(credentials.credentials)
+    user_data = _user_cache.get(cache_key)
+    if user_data is not None:
+        return user_data
+    
+    # verify_token guarantees the "sub" and "exp" claims are present
+    payload = await verify_token(credentials)
+    
+    # The subject is parsed once here, so handlers can use "id_uuid" directly
+    try:
+        user_uuid = UUID(payload["sub"])
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
+            detail="Invalid token"
         )
     
     # Add user data from payload
     user_data = {
-        "id": user_id,
+        # Canonical form, so it compares equal to IDs read from the database
+        "id": str(user_uuid),
+        "id_uuid": user_uuid,
         "email": payload.get("email"),
-        "role": payload.get("role", "staff"),  # Default to lowest role if not specified
+        # Normalized once so handlers can compare roles directly
+        "role": (payload.get("role") or "staff").lower(),  # Default to lowest role if not specified
     }
     
+    remaining = _token_time_remaining(payload)
+    if remaining > 0:
+        _user_cache.set(cache_key, user_data, ttl=remaining)
+    
     return user_data
 
 def has_permission(user_role: str, required_permission: str) -> bool:
@@ -107,7 +194,7 @@ def has_permission(user_role: str, required_permission: str) -> bool:
     if not user_role:
         return False
     
-    return required_permission in ROLE_PERMISSIONS.get(user_role, [])
+    return required_permission in ROLE_PERMISSIONS.get(user_role, _NO_PERMISSIONS)
 
 def has_all_permissions(user_role: str, required_permissions: List[str]) -> bool:
     """
@@ -116,7 +203,7 @@ def has_all_permissions(user_role: str, required_permissions: List[str]) -> bool
     if not user_role:
         return False
     
-    return all(perm in ROLE_PERMISSIONS.get(user_role, []) for perm in required_permissions)
+    return ROLE_PERMISSIONS.get(user_role, _NO_PERMISSIONS).issuperset(required_permissions)
 
 def has_any_permission(user_role: str, required_permissions: List[str]) -> bool:
     """
@@ -125,27 +212,23 @@ def has_any_permission(user_role: str, required_permissions: List[str]) -> bool:
     if not user_role:
         return False
     
-    return any(perm in ROLE_PERMISSIONS.get(user_role, []) for perm in required_permissions)
+    return not ROLE_PERMISSIONS.get(user_role, _NO_PERMISSIONS).isdisjoint(required_permissions)
 
 def has_minimum_role(user_role: str, required_role: str) -> bool:
     """
     Check if a user has at least the required role in the hierarchy.
     """
-    if not user_role:
-        return False
-    
-    user_level = ROLE_HIERARCHY.get(user_role, 0)
-    required_level = ROLE_HIERARCHY.get(required_role, 0)
-    
-    return user_level >= required_level
+    return (user_role, required_role) in ROLE_GE
 
+@lru_cache(maxsize=None)
 def require_permission(permission: str):
     """
     Dependency for routes that require a specific permission.
+    Memoized so every route guarded by the same permission shares one dependency.
     """
     async def dependency(user: Dict[str, Any] = Depends(get_current_user)):
         user_role = user.get("role")
-        if not has_permission(user_role, permission):
+        if permission not in ROLE_PERMISSIONS.get(user_role, _NO_PERMISSIONS):
             logger.warning(f"User {user.get('id')} with role {user_role} denied access: missing permission {permission}")
             raise HTTPException(
                 status_code=HTTP_403_FORBIDDEN,
@@ -159,10 +242,14 @@ def require_any_permission(permissions: List[str]):
     """
     Dependency for routes that require any of the specified permissions.
     """
+    return _require_any_permission(frozenset(permissions))
+
+@lru_cache(maxsize=None)
+def _require_any_permission(permissions: frozenset):
     async def dependency(user: Dict[str, Any] = Depends(get_current_user)):
         user_role = user.get("role")
-        if not has_any_permission(user_role, permissions):
-            logger.warning(f"User {user.get('id')} with role {user_role} denied access: missing permissions {permissions}")
+        if ROLE_PERMISSIONS.get(user_role, _NO_PERMISSIONS).isdisjoint(permissions):
+            logger.warning(f"User {user.get('id')} with role {user_role} denied access: missing permissions {sorted(permissions)}")
             raise HTTPException(
                 status_code=HTTP_403_FORBIDDEN,
                 detail=f"You don't have permission to perform this action"
@@ -175,10 +262,14 @@ def require_all_permissions(permissions: List[str]):
     """
     Dependency for routes that require all of the specified permissions.
     """
+    return _require_all_permissions(frozenset(permissions))
+
+@lru_cache(maxsize=None)
+def _require_all_permissions(permissions: frozenset):
     async def dependency(user: Dict[str, Any] = Depends(get_current_user)):
         user_role = user.get("role")
-        if not has_all_permissions(user_role, permissions):
-            logger.warning(f"User {user.get('id')} with role {user_role} denied access: missing permissions {permissions}")
+        if not ROLE_PERMISSIONS.get(user_role, _NO_PERMISSIONS).issuperset(permissions):
+            logger.warning(f"User {user.get('id')} with role {user_role} denied access: missing permissions {sorted(permissions)}")
             raise HTTPException(
                 status_code=HTTP_403_FORBIDDEN,
                 detail=f"You don't have permission to perform this action"
@@ -187,9 +278,11 @@ def require_all_permissions(permissions: List[str]):
     
     return dependency
 
+@lru_cache(maxsize=None)
 def require_role(role: str):
     """
     Dependency for routes that require a specific role or higher.
+    Memoized so every route guarded by the same role shares one dependency.
     """
     async def dependency(user: Dict[str, Any] = Depends(get_current_user)):
         user_role = user.get("role")
@@ -201,4 +294,4 @@ def require_role(role: str):
             )
         return user
     
-    return dependency 
\ No newline at end of file
+    return dependency
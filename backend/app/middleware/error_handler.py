@@ -1,97 +1,129 @@
 """
-Error handling middleware for FastAPI.
+Error handling for FastAPI.
 This module provides centralized error handling for the application.
+Errors are handled by registered exception handlers, plus a thin pure ASGI
+catch for unhandled exceptions, so successful requests carry almost no extra
+per-request cost.
 """
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.exceptions import HTTPException as StarletteHTTPException
-from typing import Callable, Dict, Any
-from app.utils.logging import setup_logger
-from app.utils.errors import APIError, ValidationError, NotFoundError
-import traceback
-import json
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.logging import setup_logger, REQUEST_ID
+from app.utils.errors import APIError
+import logging
 
 logger = setup_logger(__name__)
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
+
+def _internal_error_response(request: Request, exc: Exception) -> ORJSONResponse:
     """
-    Middleware for handling exceptions globally and returning standardized error responses.
+    Log an unhandled exception and build the generic 500 response.
+    
+    Args:
+        request: The request that failed
+        exc: The unhandled exception
+        
+    Returns:
+        JSON 500 response carrying only the request ID
     """
+    request_id = REQUEST_ID.get()
     
-    async def dispatch(self, request: Request, call_next: Callable):
+    # Log the details; the client only gets the request ID to quote, since
+    # exception text can carry database errors or secrets
+    if logger.isEnabledFor(logging.ERROR):
+        logger.error(
+            f"Internal server error on {request.url.path} (Request ID: {request_id}): {str(exc)}",
+            exc_info=exc
+        )
+    
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={
+            "success": False,
+            "message": "Internal Server Error",
+            "request_id": request_id
+        }
+    )
+
+
+class UnhandledErrorMiddleware:
+    """
+    Pure ASGI middleware that turns unhandled exceptions into the JSON 500.
+    
+    Starlette runs the Exception handler in ServerErrorMiddleware, outside all
+    user middleware, so its response would miss the CORS and request ID
+    headers. Registered innermost, this catch lets the 500 pass back through
+    them like any other response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
-        except Exception as e:
-            # Get request ID from request state if available
-            request_id = getattr(request.state, "request_id", "unknown")
-            
-            # Log the exception with traceback for debugging
-            logger.error(
-                f"Request {request_id} failed with exception: {str(e)}\n"
-                f"Traceback: {traceback.format_exc()}"
-            )
-            
-            # Handle different exception types
-            if isinstance(e, APIError):
-                # Our custom API exceptions
-                return JSONResponse(
-                    status_code=e.status_code,
-                    content=e.to_dict()
-                )
-            elif isinstance(e, StarletteHTTPException):
-                # FastAPI/Starlette HTTP exceptions
-                return JSONResponse(
-                    status_code=e.status_code,
-                    content={
-                        "success": False,
-                        "message": str(e.detail),
-                        "code": f"HTTP_{e.status_code}"
-                    }
-                )
-            else:
-                # Generic exceptions
-                return JSONResponse(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    content={
-                        "success": False,
-                        "message": "Internal Server Error",
-                        "detail": str(e),
-                        "request_id": request_id
-                    }
-                )
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Too late to replace a response that is already on the wire
+            if response_started:
+                raise
+            response = _internal_error_response(Request(scope), exc)
+            await response(scope, receive, send)
+
 
 def setup_error_handler(app: FastAPI) -> None:
     """
-    Configure the application with error handling middleware and exception handlers.
+    Configure the application with exception handlers.
+    Call this before adding any other middleware, so the unhandled error
+    catch ends up innermost.
     
     Args:
         app: FastAPI application instance
     """
-    # Add the middleware for catching general exceptions
-    app.add_middleware(ErrorHandlerMiddleware)
+    app.add_middleware(UnhandledErrorMiddleware)
     
     # Setup specific exception handlers
+    @app.exception_handler(APIError)
+    async def api_error_handler(request: Request, exc: APIError):
+        # Our custom API exceptions
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error(f"Request {REQUEST_ID.get()} failed with exception: {str(exc)}")
+        
+        return ORJSONResponse(
+            status_code=exc.status_code,
+            content=exc.to_dict()
+        )
+    
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
         # Format validation errors in a more readable way
-        errors = []
-        for error in exc.errors():
-            loc = error.get("loc", [])
-            field = loc[-1] if loc else ""
-            type_error = error.get("type", "")
-            msg = error.get("msg", "")
-            
-            errors.append({
-                "field": field,
-                "type": type_error,
-                "message": msg
-            })
+        raw_errors = exc.errors()
+        errors = [
+            {
+                "field": (error.get("loc") or ("",))[-1],
+                "type": error.get("type", ""),
+                "message": error.get("msg", "")
+            }
+            for error in raw_errors
+        ]
         
-        logger.warning(f"Validation error: {json.dumps(errors)}")
+        # Pass the errors as a structured extra; they are only rendered if a
+        # handler actually emits the record
+        logger.warning("Validation error: %s", errors, extra={"validation_errors": errors})
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             content={
                 "success": False,
@@ -103,7 +135,7 @@ def setup_error_handler(app: FastAPI) -> None:
     
     @app.exception_handler(404)
     async def not_found_exception_handler(request: Request, exc):
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
             content={
                 "success": False,
@@ -113,22 +145,9 @@ def setup_error_handler(app: FastAPI) -> None:
             }
         )
     
-    @app.exception_handler(500)
-    async def internal_error_handler(request: Request, exc):
-        request_id = getattr(request.state, "request_id", "unknown")
-        
-        # Log the error
-        logger.error(
-            f"Internal server error on {request.url.path} (Request ID: {request_id}): {str(exc)}\n"
-            f"Traceback: {traceback.format_exc()}"
-        )
-        
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "success": False,
-                "message": "Internal server error",
-                "code": "INTERNAL_ERROR",
-                "request_id": request_id
-            }
-        ) 
\ No newline at end of file
+    # Last resort for exceptions raised by the middleware themselves. Starlette
+    # routes both Exception and 500 to its outermost ServerErrorMiddleware, so
+    # only one handler is kept.
+    @app.exception_handler(Exception)
+    async def internal_error_handler(request: Request, exc: Exception):
+        return _internal_error_response(request, exc)
@@ -2,29 +2,37 @@
 Rate limiting middleware for FastAPI.
 This module provides rate limiting to prevent API abuse.
 """
+import re
 import time
-from fastapi import FastAPI, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Dict, Callable, List, Optional
+import threading
+from collections import deque
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Deque, List, Optional
 from app.utils.logging import setup_logger
 from app.utils.errors import RateLimitError
+from app.utils.cache import TTLCache
 
 logger = setup_logger(__name__)
 
 class RateLimiter:
     """Base rate limiter class."""
     
-    def __init__(self, rate_limit: int, time_window: int):
+    def __init__(self, rate_limit: int, time_window: int, max_clients: int = 100000):
         """
         Initialize the rate limiter.
         
         Args:
             rate_limit: Maximum number of requests allowed
             time_window: Time window in seconds
+            max_clients: Maximum number of clients to track; idle clients
+                are evicted after two time windows
         """
         self.rate_limit = rate_limit
         self.time_window = time_window
-        self.requests: Dict[str, List[float]] = {}
+        self.requests = TTLCache(maxsize=max_clients, ttl=time_window * 2)
+        self._lock = threading.Lock()
     
     def is_rate_limited(self, key: str) -> bool:
         """
@@ -37,21 +45,26 @@ class RateLimiter:
             True if rate limited, False otherwise
         """
         current_time = time.time()
-        if key not in self.requests:
-            self.requests[key] = []
-        
-        # Remove timestamps older than the time window
-        self.requests[key] = [
-            ts for ts in self.requests[key] if current_time - ts <= self.time_window
-        ]
-        
-        # Check if the number of requests exceeds the rate limit
-        if len(self.requests[key]) >= self.rate_limit:
-            return True
-        
-        # Add current timestamp
-        self.requests[key].append(current_time)
-        return False
+        with self._lock:
+            timestamps: Optional[Deque[float]] = self.requests.get(key)
+            if timestamps is None:
+                timestamps = deque()
+            
+            # Refresh the entry so active clients are never evicted as idle
+            self.requests.set(key, timestamps)
+            
+            # Remove timestamps older than the time window (oldest are on the left)
+            cutoff = current_time - self.time_window
+            while timestamps and timestamps[0] < cutoff:
+                timestamps.popleft()
+            
+            # Check if the number of requests exceeds the rate limit
+            if len(timestamps) >= self.rate_limit:
+                return True
+            
+            # Add current timestamp
+            timestamps.append(current_time)
+            return False
     
     def get_retry_after(self, key: str) -> Optional[int]:
         """
@@ -63,20 +76,26 @@ class RateLimiter:
         Returns:
             Seconds until rate limit resets or None if not rate limited
         """
-        if key not in self.requests or not self.requests[key]:
-            return None
+        with self._lock:
+            timestamps = self.requests.get(key)
+            if not timestamps:
+                return None
+            oldest_timestamp = timestamps[0]
         
         current_time = time.time()
-        oldest_timestamp = min(self.requests[key])
         
         return max(1, int(self.time_window - (current_time - oldest_timestamp)))
 
-class RateLimiterMiddleware(BaseHTTPMiddleware):
-    """Middleware for rate limiting API requests."""
+class RateLimiterMiddleware:
+    """
+    Middleware for rate limiting API requests.
+    Implemented as a pure ASGI middleware so allowed requests pass straight
+    through to the application.
+    """
     
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         rate_limit: int = 100,
         time_window: int = 60,
         exempt_paths: List[str] = None
@@ -85,37 +104,55 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         Initialize the middleware.
         
         Args:
-            app: FastAPI application instance
+            app: ASGI application to wrap
             rate_limit: Maximum number of requests allowed in the time window
             time_window: Time window in seconds
             exempt_paths: List of paths exempt from rate limiting
         """
-        super().__init__(app)
+        self.app = app
         self.limiter = RateLimiter(rate_limit, time_window)
         self.exempt_paths = exempt_paths or ["/health", "/docs", "/openapi.json"]
+        # Match all exempt prefixes with a single anchored regex
+        self._exempt_re = re.compile(
+            "|".join(re.escape(exempt) for exempt in self.exempt_paths)
+        )
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Skip rate limiting for exempt paths
-        path = request.url.path
-        if any(path.startswith(exempt) for exempt in self.exempt_paths):
-            return await call_next(request)
+        path = scope["path"]
+        if self._exempt_re.match(path):
+            await self.app(scope, receive, send)
+            return
         
         # Use client IP as the rate limit key
-        client_ip = request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
         
         # Check if rate limited
         if self.limiter.is_rate_limited(client_ip):
             retry_after = self.limiter.get_retry_after(client_ip)
             logger.warning(f"Rate limit exceeded for {client_ip}")
             
-            # Raise custom rate limit error
-            raise RateLimitError(
+            # Respond directly instead of raising through the middleware stack
+            error = RateLimitError(
                 message="Rate limit exceeded",
                 retry_after=retry_after
             )
+            headers = {"Retry-After": str(retry_after)} if retry_after else None
+            response = ORJSONResponse(
+                status_code=error.status_code,
+                content=error.to_dict(),
+                headers=headers
+            )
+            await response(scope, receive, send)
+            return
         
         # Process the request if not rate limited
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 def setup_rate_limiter(
     app: FastAPI,
@@ -2,74 +2,98 @@
 Request logging middleware for FastAPI.
 This module provides request and response logging for all API endpoints.
 """
+import logging
 import time
-import uuid
-from fastapi import FastAPI, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-from typing import Callable
-from app.utils.logging import setup_logger
+import secrets
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.logging import setup_logger, REQUEST_ID
 
 logger = setup_logger(__name__)
 
-class RequestLoggerMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging API requests and responses."""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+class RequestLoggerMiddleware:
+    """
+    Middleware for logging API requests and responses.
+    Implemented as a pure ASGI middleware so responses are streamed through
+    without the task group and body buffering of BaseHTTPMiddleware.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Generate a unique request ID
-        request_id = str(uuid.uuid4())
-        
-        # Add request ID to the request state
-        request.state.request_id = request_id
-        
+        request_id = secrets.token_hex(8)
+
+        # Add request ID to the request context and state. Each request runs
+        # in its own task, so the context variable needs no reset.
+        REQUEST_ID.set(request_id)
+        scope.setdefault("state", {})["request_id"] = request_id
+
         # Capture request info
-        start_time = time.time()
-        method = request.method
-        url = str(request.url)
-        client_host = request.client.host if request.client else "unknown"
-        
+        start_time = time.perf_counter()
+        method = scope["method"]
+        log_info = logger.isEnabledFor(logging.INFO)
+
         # Log the incoming request
-        logger.info(
-            f"Request {request_id} started: {method} {url} from {client_host}"
-        )
-        
-        # Process the request
-        try:
-            response = await call_next(request)
-            
-            # Calculate processing time
-            process_time = time.time() - start_time
-            formatted_process_time = "{:.3f}".format(process_time)
-            
-            # Add headers to the response
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Process-Time"] = formatted_process_time
-            
-            # Log the response
-            status_code = response.status_code
+        if log_info:
+            client = scope.get("client")
+            client_host = client[0] if client else "unknown"
             logger.info(
-                f"Request {request_id} completed: {method} {url} - {status_code} in {formatted_process_time}s"
+                "Request %s started: %s %s from %s",
+                request_id, method, scope["path"], client_host,
+                extra={"request_id": request_id, "method": method, "path": scope["path"], "client": client_host}
             )
-            
-            return response
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Calculate processing time
+                process_time = time.perf_counter() - start_time
+                formatted_process_time = f"{process_time:.3f}"
+
+                # Add headers to the response
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", request_id)
+                headers.append("X-Process-Time", formatted_process_time)
+
+                # Log the response
+                if log_info:
+                    logger.info(
+                        "Request %s completed: %s %s - %s in %ss",
+                        request_id, method, scope["path"], message["status"], formatted_process_time,
+                        extra={
+                            "request_id": request_id,
+                            "method": method,
+                            "path": scope["path"],
+                            "status": message["status"],
+                            "duration_ms": round(process_time * 1000, 3)
+                        }
+                    )
+
+            await send(message)
+
+        # Process the request
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Calculate processing time
-            process_time = time.time() - start_time
-            formatted_process_time = "{:.3f}".format(process_time)
-            
             # Log the exception
             logger.error(
-                f"Request {request_id} failed: {method} {url} - Exception: {str(e)} in {formatted_process_time}s"
+                f"Request {request_id} failed: {method} {scope['path']} - Exception: {str(e)} in {time.perf_counter() - start_time:.3f}s"
             )
-            
+
             # Re-raise the exception for the error handler middleware
             raise
 
 def setup_request_logger(app: FastAPI) -> None:
     """
     Configure the application with request logging middleware.
-    
+
     Args:
         app: FastAPI application instance
     """
-    app.add_middleware(RequestLoggerMiddleware) 
\ No newline at end of file
+    app.add_middleware(RequestLoggerMiddleware)
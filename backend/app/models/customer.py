@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field, EmailStr, validator, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, EmailStr, HttpUrl
+from pydantic.dataclasses import dataclass
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, List, Dict, Any
@@ -39,7 +40,9 @@ class CustomerCreate(CustomerBase):
 
 
 class CustomerUpdate(BaseModel):
-    email: Optional[EmailStr] = None
+    # email and website are plain strings here; the service layer checks them
+    # only when they are actually being updated
+    email: Optional[str] = None
     full_name: Optional[str] = None
     phone: Optional[str] = None
     address: Optional[str] = None
@@ -50,7 +53,7 @@ class CustomerUpdate(BaseModel):
     business_name: Optional[str] = None
     business_id: Optional[str] = None
     producer_type: Optional[ProducerType] = None
-    website: Optional[HttpUrl] = None
+    website: Optional[str] = None
     description: Optional[str] = None
     is_active: Optional[bool] = None
 
@@ -60,8 +63,7 @@ class Customer(CustomerBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CustomerWithDetails(Customer):
@@ -77,15 +79,16 @@ class CustomerNoteCreate(CustomerNoteBase):
     customer_id: UUID
 
 
-class CustomerNote(CustomerNoteBase):
+# Read-only projection loaded in bulk with customer details, so it is a frozen,
+# slotted dataclass rather than a BaseModel
+@dataclass(config=ConfigDict(from_attributes=True), frozen=True, slots=True, kw_only=True)
+class CustomerNote:
+    content: str
     id: UUID
     customer_id: UUID
     created_by: UUID
     created_at: datetime
 
-    class Config:
-        orm_mode = True
-
 
 class CustomerPreferencesBase(BaseModel):
     preferences: Dict[str, Any] = {}
@@ -103,8 +106,7 @@ class CustomerPreferences(CustomerPreferencesBase):
     customer_id: UUID
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Producer alias classes for consistent API naming
@@ -113,4 +115,4 @@ ProducerWithDetails = CustomerWithDetails
 
 
 # Update forward references
-CustomerWithDetails.update_forward_refs() 
\ No newline at end of file
+CustomerWithDetails.model_rebuild() 
\ No newline at end of file
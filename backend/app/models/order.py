@@ -1,11 +1,15 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from decimal import Decimal
 
 
-class OrderItem(BaseModel):
+# Read-only projections that are built in bulk when loading orders. Frozen,
+# slotted dataclasses are lighter to create and hold than BaseModel instances.
+@dataclass(config=ConfigDict(from_attributes=True), frozen=True, slots=True, kw_only=True)
+class OrderItem:
     id: UUID
     order_id: UUID
     product_id: UUID
@@ -17,11 +21,9 @@ class OrderItem(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
     created_at: datetime
 
-    class Config:
-        orm_mode = True
 
-
-class OrderHistory(BaseModel):
+@dataclass(config=ConfigDict(from_attributes=True), frozen=True, slots=True, kw_only=True)
+class OrderHistory:
     id: UUID
     order_id: UUID
     previous_status: Optional[str] = None
@@ -30,11 +32,9 @@ class OrderHistory(BaseModel):
     notes: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        orm_mode = True
-
 
-class OrderNote(BaseModel):
+@dataclass(config=ConfigDict(from_attributes=True), frozen=True, slots=True, kw_only=True)
+class OrderNote:
     id: UUID
     order_id: UUID
     user_id: Optional[UUID] = None
@@ -42,9 +42,6 @@ class OrderNote(BaseModel):
     is_internal: bool = False
     created_at: datetime
 
-    class Config:
-        orm_mode = True
-
 
 class Order(BaseModel):
     id: UUID
@@ -63,5 +60,4 @@ class Order(BaseModel):
     history: Optional[List[OrderHistory]] = None
     order_notes: Optional[List[OrderNote]] = None
 
-    class Config:
-        orm_mode = True 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
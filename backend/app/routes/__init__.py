@@ -2,30 +2,18 @@
 API Router organization module.
 This module centralizes all route imports and provides a structured way
 to include them in the main FastAPI application.
+Route modules are imported inside setup_routes, so importing this package
+doesn't pull in every router and its service dependencies.
 """
 from fastapi import APIRouter
-from .users import router as users_router
-from .auth import router as auth_router
-from .products import router as products_router
-from .customers import router as customers_router
-from .orders import router as orders_router
-from .email import router as email_router
-from .api_info import router as info_router
-from .fulfillment import router as fulfillment_router
 from app.utils.config import settings
 
-# Create API version router
-api_router_v1 = APIRouter()
-
-# Include all resource routers with appropriate prefixes and tags
-api_router_v1.include_router(auth_router, prefix="/auth", tags=["auth"])
-api_router_v1.include_router(users_router, prefix="/users", tags=["users"])
-api_router_v1.include_router(products_router, prefix="/products", tags=["products"])
-api_router_v1.include_router(customers_router, prefix="/customers", tags=["customers"])
-api_router_v1.include_router(orders_router, prefix="/orders", tags=["orders"])
-api_router_v1.include_router(email_router, prefix="/email", tags=["email"])
-api_router_v1.include_router(fulfillment_router, prefix="/fulfillment", tags=["fulfillment"])
-api_router_v1.include_router(info_router, tags=["info"])
+# Static payload for the /api root endpoint
+API_ROOT_PAYLOAD = {
+    "versions": [settings.API_VERSION],
+    "current_version": settings.API_VERSION,
+    "documentation": "/docs"
+}
 
 # Function to setup all routes for the main application
 def setup_routes(app):
@@ -35,6 +23,28 @@ def setup_routes(app):
     Args:
         app: FastAPI application instance
     """
+    from .users import router as users_router
+    from .auth import router as auth_router
+    from .products import router as products_router
+    from .customers import router as customers_router
+    from .orders import router as orders_router
+    from .email import router as email_router
+    from .api_info import router as info_router
+    from .fulfillment import router as fulfillment_router
+    
+    # Create API version router
+    api_router_v1 = APIRouter()
+    
+    # Include all resource routers with appropriate prefixes and tags
+    api_router_v1.include_router(auth_router, prefix="/auth", tags=["auth"])
+    api_router_v1.include_router(users_router, prefix="/users", tags=["users"])
+    api_router_v1.include_router(products_router, prefix="/products", tags=["products"])
+    api_router_v1.include_router(customers_router, prefix="/customers", tags=["customers"])
+    api_router_v1.include_router(orders_router, prefix="/orders", tags=["orders"])
+    api_router_v1.include_router(email_router, prefix="/email", tags=["email"])
+    api_router_v1.include_router(fulfillment_router, prefix="/fulfillment", tags=["fulfillment"])
+    api_router_v1.include_router(info_router, tags=["info"])
+    
     # Include the main API router with version prefix
     app.include_router(api_router_v1, prefix=f"/api/{settings.API_VERSION}")
     
@@ -42,8 +52,4 @@ def setup_routes(app):
     @app.get("/api")
     async def api_root():
         """Get API version information."""
-        return {
-            "versions": [settings.API_VERSION],
-            "current_version": settings.API_VERSION,
-            "documentation": "/docs"
-        } 
\ No newline at end of file
+        return API_ROOT_PAYLOAD 
\ No newline at end of file
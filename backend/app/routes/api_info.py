@@ -2,8 +2,9 @@
 API information endpoints module.
 This module provides endpoints for API metadata, version information, and health checks.
 """
-from fastapi import APIRouter, Depends, status
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.responses import ORJSONResponse
+import orjson
 from app.utils.config import settings
 import time
 import platform
@@ -12,58 +13,77 @@ import os
 # Start time of the server
 START_TIME = time.time()
 
+
+def _read_git_commit() -> str:
+    """
+    Get the git commit the running build was made from.
+    The commit is baked in at build time through the GIT_COMMIT build arg,
+    with a .build_info file as a fallback.
+    
+    Returns:
+        Commit hash, or "unknown" if it wasn't recorded
+    """
+    git_commit = os.getenv("GIT_COMMIT")
+    if git_commit:
+        return git_commit
+    
+    try:
+        with open(".build_info", encoding="utf-8") as f:
+            return f.read().strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+# Static API information response
+API_INFO = {
+    "name": "Order Management API",
+    "version": settings.API_VERSION,
+    "environment": settings.ENVIRONMENT,
+    "docs_url": "/docs",
+    "redoc_url": "/redoc"
+}
+
+# Static part of the health check response
+HEALTH_STATIC = {
+    "status": "healthy",
+    "environment": settings.ENVIRONMENT,
+    "version": settings.API_VERSION,
+    "python_version": platform.python_version(),
+    "system": platform.system(),
+    "hostname": platform.node(),
+}
+
+# Version information never changes while the process runs
+VERSION_INFO = {
+    "version": settings.API_VERSION,
+    "environment": settings.ENVIRONMENT,
+    "git_commit": _read_git_commit(),
+    "build_date": os.getenv("BUILD_DATE", "development")
+}
+
+# Encode the static payloads once instead of serializing them per request
+API_INFO_JSON = orjson.dumps(API_INFO)
+VERSION_INFO_JSON = orjson.dumps(VERSION_INFO)
+
 router = APIRouter()
 
-@router.get("/", response_model=Dict[str, Any])
+@router.get("/")
 async def get_api_info():
     """
     Get information about the API including version and documentation.
     """
-    return {
-        "name": "Order Management API",
-        "version": settings.API_VERSION,
-        "environment": settings.ENVIRONMENT,
-        "docs_url": "/docs",
-        "redoc_url": "/redoc"
-    }
+    return Response(API_INFO_JSON, media_type="application/json")
 
-@router.get("/health", response_model=Dict[str, Any])
+@router.get("/health")
 async def health_check():
     """
     Health check endpoint for monitoring and load balancers.
     """
-    uptime = int(time.time() - START_TIME)
-    
-    return {
-        "status": "healthy",
-        "environment": settings.ENVIRONMENT,
-        "version": settings.API_VERSION,
-        "uptime_seconds": uptime,
-        "python_version": platform.python_version(),
-        "system": platform.system(),
-        "hostname": platform.node(),
-    }
+    return ORJSONResponse({**HEALTH_STATIC, "uptime_seconds": int(time.time() - START_TIME)})
 
-@router.get("/version", response_model=Dict[str, Any])
+@router.get("/version")
 async def version_info():
     """
     Get detailed version information about the API.
     """
-    # Try to read git commit information if available
-    git_commit = "unknown"
-    try:
-        if os.path.exists(".git"):
-            import subprocess
-            git_commit = subprocess.check_output(
-                ["git", "rev-parse", "HEAD"], 
-                stderr=subprocess.DEVNULL
-            ).decode("utf-8").strip()
-    except:
-        pass
-    
-    return {
-        "version": settings.API_VERSION,
-        "environment": settings.ENVIRONMENT,
-        "git_commit": git_commit,
-        "build_date": os.getenv("BUILD_DATE", "development")
-    } 
\ No newline at end of file
+    return Response(VERSION_INFO_JSON, media_type="application/json")
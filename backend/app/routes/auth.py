@@ -1,19 +1,91 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Body
+from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
-from app.schemas.user import UserCreate, UserResponse, UserUpdate
+from app.schemas.user import (
+    UserCreate, UserResponse, UserUpdate,
+    PasswordResetRequest, PasswordUpdate, RefreshTokenRequest
+)
 from app.services import user_service
 from app.services.supabase import get_supabase_client
-from app.utils.auth import get_current_user, get_current_admin
-from typing import Dict, List, Any
+from app.utils.auth import get_current_user, get_current_admin, invalidate_cached_user, oauth2_scheme
+from app.utils.routing import JSONBodyRoute
+from app.utils.logging import setup_logger
+from typing import Dict, List, Any, Optional, Set
 from uuid import UUID
+import asyncio
 
 router = APIRouter(
     prefix="/auth",
-    tags=["auth"]
+    tags=["auth"],
+    route_class=JSONBodyRoute
 )
 
+# The Supabase client is synchronous, so its calls are run in the threadpool
+# to keep the event loop free while waiting on the network
 supabase = get_supabase_client()
 
+logger = setup_logger(__name__)
+
+# Bound the number of audit log writes in flight at once. The semaphore is
+# created on first use, inside the running event loop.
+AUTH_EVENT_CONCURRENCY = 10
+_auth_event_semaphore: Optional[asyncio.Semaphore] = None
+
+# Keep references to pending audit tasks so they aren't garbage collected.
+# Past the cap new events are dropped, so a burst can't queue without bound.
+MAX_PENDING_AUTH_EVENTS = 1000
+_pending_auth_events: Set[asyncio.Task] = set()
+
+
+def _get_auth_event_semaphore() -> asyncio.Semaphore:
+    """
+    Get the semaphore bounding audit log writes, creating it on first use.
+    """
+    global _auth_event_semaphore
+    if _auth_event_semaphore is None:
+        _auth_event_semaphore = asyncio.Semaphore(AUTH_EVENT_CONCURRENCY)
+    return _auth_event_semaphore
+
+
+async def _log_auth_event(user_id: str, event_type: str) -> None:
+    """
+    Record an authentication event in the audit log.
+    Failures are logged and swallowed; auditing must never fail the request.
+    
+    Args:
+        user_id: ID of the user the event belongs to
+        event_type: Type of event (login, logout, password_change)
+    """
+    try:
+        async with _get_auth_event_semaphore():
+            await asyncio.to_thread(supabase.rpc(
+                'log_auth_event',
+                {
+                    'p_user_id': user_id,
+                    'p_event_type': event_type,
+                    'p_ip_address': None,
+                    'p_user_agent': None
+                }
+            ).execute)
+    except Exception as e:
+        logger.warning("Failed to log auth event %s for user %s: %s", event_type, user_id, e)
+
+
+def _schedule_auth_event(user_id: str, event_type: str) -> None:
+    """
+    Log an authentication event in the background without delaying the response.
+    
+    Args:
+        user_id: ID of the user the event belongs to
+        event_type: Type of event (login, logout, password_change)
+    """
+    if len(_pending_auth_events) >= MAX_PENDING_AUTH_EVENTS:
+        logger.warning("Dropping auth event %s for user %s: too many pending", event_type, user_id)
+        return
+    
+    task = asyncio.create_task(_log_auth_event(user_id, event_type))
+    _pending_auth_events.add(task)
+    task.add_done_callback(_pending_auth_events.discard)
+
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserCreate):
@@ -22,8 +94,7 @@ async def register(user_data: UserCreate):
     """
     try:
         # Check if user with email already exists
-        existing_user = await user_service.get_user_by_email(user_data.email)
-        if existing_user:
+        if await user_service.email_exists(user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User with this email already exists"
@@ -44,25 +115,13 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()) -> Dict[str, s
     """
     try:
         # Authenticate user with Supabase
-        response = supabase.auth.sign_in_with_password({
+        response = await asyncio.to_thread(supabase.auth.sign_in_with_password, {
             "email": form_data.username,
             "password": form_data.password
         })
         
-        # Log successful login
-        try:
-            supabase.rpc(
-                'log_auth_event',
-                {
-                    'p_user_id': response.user.id,
-                    'p_event_type': 'login',
-                    'p_ip_address': None,
-                    'p_user_agent': None
-                }
-            ).execute()
-        except Exception:
-            # Don't fail the login if logging fails
-            pass
+        # Log successful login in the background
+        _schedule_auth_event(response.user.id, 'login')
         
         return {
             "access_token": response.session.access_token,
@@ -78,28 +137,20 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()) -> Dict[str, s
 
 
 @router.post("/logout")
-async def logout(current_user: Dict = Depends(get_current_user)):
+async def logout(
+    current_user: Dict = Depends(get_current_user),
+    token: str = Depends(oauth2_scheme)
+):
     """
     Log out the current user by invalidating their token.
     """
     try:
-        # Log the logout event
-        try:
-            supabase.rpc(
-                'log_auth_event',
-                {
-                    'p_user_id': current_user["id"],
-                    'p_event_type': 'logout',
-                    'p_ip_address': None,
-                    'p_user_agent': None
-                }
-            ).execute()
-        except Exception:
-            # Don't fail the logout if logging fails
-            pass
+        # Log the logout event in the background
+        _schedule_auth_event(current_user["id"], 'logout')
             
         # Sign out the current user
-        supabase.auth.sign_out()
+        await asyncio.to_thread(supabase.auth.sign_out)
+        invalidate_cached_user(token)
         return {"message": "Successfully logged out"}
     except Exception as e:
         raise HTTPException(
@@ -109,19 +160,19 @@ async def logout(current_user: Dict = Depends(get_current_user)):
 
 
 @router.post("/password-reset")
-async def request_password_reset(email: str = Body(..., embed=True)):
+async def request_password_reset(reset_request: PasswordResetRequest):
     """
     Request a password reset email for the specified user.
     """
+    email = reset_request.email
     try:
         # Check if user exists
-        user = await user_service.get_user_by_email(email)
-        if not user:
+        if not await user_service.email_exists(email):
             # Return success even if email doesn't exist to prevent email enumeration
             return {"message": "Password reset email sent if the account exists"}
         
         # Send password reset email
-        supabase.auth.reset_password_email(email)
+        await asyncio.to_thread(supabase.auth.reset_password_email, email)
         
         return {"message": "Password reset email sent if the account exists"}
     except Exception as e:
@@ -131,9 +182,9 @@ async def request_password_reset(email: str = Body(..., embed=True)):
 
 @router.post("/password-update")
 async def update_password(
-    current_password: str = Body(...),
-    new_password: str = Body(...),
-    current_user: Dict = Depends(get_current_user)
+    password_update: PasswordUpdate,
+    current_user: Dict = Depends(get_current_user),
+    token: str = Depends(oauth2_scheme)
 ):
     """
     Update the current user's password.
@@ -141,9 +192,9 @@ async def update_password(
     try:
         # Verify current password
         try:
-            supabase.auth.sign_in_with_password({
+            await asyncio.to_thread(supabase.auth.sign_in_with_password, {
                 "email": current_user["email"],
-                "password": current_password
+                "password": password_update.current_password
             })
         except Exception:
             raise HTTPException(
@@ -152,25 +203,15 @@ async def update_password(
             )
         
         # Update password
-        supabase.auth.admin.update_user_by_id(
+        await asyncio.to_thread(
+            supabase.auth.admin.update_user_by_id,
             current_user["id"],
-            {"password": new_password}
+            {"password": password_update.new_password}
         )
+        invalidate_cached_user(token)
         
-        # Log password change
-        try:
-            supabase.rpc(
-                'log_auth_event',
-                {
-                    'p_user_id': current_user["id"],
-                    'p_event_type': 'password_change',
-                    'p_ip_address': None,
-                    'p_user_agent': None
-                }
-            ).execute()
-        except Exception:
-            # Don't fail the password change if logging fails
-            pass
+        # Log password change in the background
+        _schedule_auth_event(current_user["id"], 'password_change')
         
         return {"message": "Password updated successfully"}
     except HTTPException:
@@ -191,12 +232,12 @@ async def get_current_user_info(current_user: Dict = Depends(get_current_user)):
 
 
 @router.post("/refresh-token")
-async def refresh_access_token(refresh_token: str = Body(..., embed=True)):
+async def refresh_access_token(refresh_request: RefreshTokenRequest):
     """
     Refresh the access token using a refresh token.
     """
     try:
-        response = supabase.auth.refresh_session(refresh_token)
+        response = await asyncio.to_thread(supabase.auth.refresh_session, refresh_request.refresh_token)
         
         return {
             "access_token": response.session.access_token,
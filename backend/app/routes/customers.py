@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, Body, status
+from pydantic import TypeAdapter
 from typing import List, Optional
 from uuid import UUID
 
@@ -12,13 +13,21 @@ from app.models.user import User
 from app.services.auth import get_current_user
 from app.services.customers import (
     get_customers, get_customer_by_id, create_customer, update_customer,
-    delete_customer, get_customer_orders, add_customer_note, get_customer_notes,
-    get_customer_preferences, create_or_update_customer_preferences
+    delete_customer, get_customer_orders, get_customer_notes, add_customer_note,
+    create_or_update_customer_preferences
 )
 from app.utils.logging import setup_logger
+from app.utils.routing import JSONBodyRoute
+from app.utils.response import PydanticJSONResponse
 
 logger = setup_logger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=JSONBodyRoute)
+
+# Response serializers built once at import and reused for every request
+CUSTOMER_LIST_ADAPTER = TypeAdapter(List[Customer])
+CUSTOMER_DETAILS_ADAPTER = TypeAdapter(CustomerWithDetails)
+CUSTOMER_NOTE_LIST_ADAPTER = TypeAdapter(List[CustomerNote])
+ORDER_LIST_ADAPTER = TypeAdapter(List[Order])
 
 
 @router.get("/", response_model=List[Customer])
@@ -32,8 +41,8 @@ async def list_customers(
     """
     List all customers with pagination, search, and filtering.
     """
-    logger.info(f"Getting customers list: skip={skip}, limit={limit}, search={search}, type={customer_type}")
-    return await get_customers(skip, limit, search, customer_type)
+    logger.info("Getting customers list: skip=%s, limit=%s, search=%s, type=%s", skip, limit, search, customer_type)
+    return PydanticJSONResponse(await get_customers(skip, limit, search, customer_type), adapter=CUSTOMER_LIST_ADAPTER)
 
 
 @router.post("/", response_model=Customer, status_code=status.HTTP_201_CREATED)
@@ -44,8 +53,8 @@ async def add_customer(
     """
     Create a new customer.
     """
-    logger.info(f"Creating new customer: {customer.email}")
-    return await create_customer(customer)
+    logger.info("Creating new customer: %s", customer.email)
+    return PydanticJSONResponse(await create_customer(customer), status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/{customer_id}", response_model=CustomerWithDetails)
@@ -56,11 +65,11 @@ async def get_customer(
     """
     Get detailed information about a specific customer.
     """
-    logger.info(f"Getting customer details: {customer_id}")
+    logger.info("Getting customer details: %s", customer_id)
     customer = await get_customer_by_id(customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
-    return customer
+    return PydanticJSONResponse(customer, adapter=CUSTOMER_DETAILS_ADAPTER)
 
 
 @router.put("/{customer_id}", response_model=Customer)
@@ -72,11 +81,11 @@ async def modify_customer(
     """
     Update a customer's information.
     """
-    logger.info(f"Updating customer: {customer_id}")
+    logger.info("Updating customer: %s", customer_id)
     updated_customer = await update_customer(customer_id, customer)
     if not updated_customer:
         raise HTTPException(status_code=404, detail="Customer not found")
-    return updated_customer
+    return PydanticJSONResponse(updated_customer)
 
 
 @router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -87,7 +96,7 @@ async def remove_customer(
     """
     Delete a customer.
     """
-    logger.info(f"Deleting customer: {customer_id}")
+    logger.info("Deleting customer: %s", customer_id)
     success = await delete_customer(customer_id)
     if not success:
         raise HTTPException(status_code=404, detail="Customer not found")
@@ -104,12 +113,12 @@ async def list_customer_orders(
     """
     Get a customer's order history.
     """
-    logger.info(f"Getting orders for customer: {customer_id}")
-    customer = await get_customer_by_id(customer_id)
-    if not customer:
+    logger.info("Getting orders for customer: %s", customer_id)
+    orders = await get_customer_orders(customer_id, skip, limit)
+    if orders is None:
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    return await get_customer_orders(customer_id, skip, limit)
+    return PydanticJSONResponse(orders, adapter=ORDER_LIST_ADAPTER)
 
 
 @router.get("/{customer_id}/notes", response_model=List[CustomerNote])
@@ -120,12 +129,12 @@ async def list_customer_notes(
     """
     Get all notes for a customer.
     """
-    logger.info(f"Getting notes for customer: {customer_id}")
-    customer = await get_customer_by_id(customer_id)
-    if not customer:
+    logger.info("Getting notes for customer: %s", customer_id)
+    notes = await get_customer_notes(customer_id)
+    if notes is None:
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    return await get_customer_notes(customer_id)
+    return PydanticJSONResponse(notes, adapter=CUSTOMER_NOTE_LIST_ADAPTER)
 
 
 @router.post("/{customer_id}/notes", response_model=CustomerNote, status_code=status.HTTP_201_CREATED)
@@ -140,12 +149,12 @@ async def create_customer_note(
     if note.customer_id != customer_id:
         raise HTTPException(status_code=400, detail="Customer ID mismatch")
     
-    logger.info(f"Adding note for customer: {customer_id}")
-    customer = await get_customer_by_id(customer_id)
-    if not customer:
+    logger.info("Adding note for customer: %s", customer_id)
+    created_note = await add_customer_note(note, current_user.id)
+    if not created_note:
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    return await add_customer_note(note, current_user.id)
+    return PydanticJSONResponse(created_note, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/{customer_id}/preferences", response_model=CustomerPreferences)
@@ -156,16 +165,17 @@ async def get_preferences(
     """
     Get customer preferences.
     """
-    logger.info(f"Getting preferences for customer: {customer_id}")
+    logger.info("Getting preferences for customer: %s", customer_id)
     customer = await get_customer_by_id(customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    preferences = await get_customer_preferences(customer_id)
+    # Preferences are loaded together with the customer
+    preferences = customer.preferences
     if not preferences:
         raise HTTPException(status_code=404, detail="Customer preferences not found")
     
-    return preferences
+    return PydanticJSONResponse(preferences)
 
 
 @router.put("/{customer_id}/preferences", response_model=CustomerPreferences)
@@ -177,14 +187,16 @@ async def update_preferences(
     """
     Update customer preferences.
     """
-    logger.info(f"Updating preferences for customer: {customer_id}")
-    customer = await get_customer_by_id(customer_id)
-    if not customer:
-        raise HTTPException(status_code=404, detail="Customer not found")
-    
-    preferences_create = CustomerPreferencesCreate(
+    logger.info("Updating preferences for customer: %s", customer_id)
+    # Both values were already validated (path UUID and request body), so
+    # build the model without running validation again
+    preferences_create = CustomerPreferencesCreate.model_construct(
         customer_id=customer_id,
         preferences=preferences.preferences
     )
     
-    return await create_or_update_customer_preferences(preferences_create) 
\ No newline at end of file
+    updated = await create_or_update_customer_preferences(preferences_create)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    
+    return PydanticJSONResponse(updated)
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends
 from ..services.email_service import EmailService
 from ..schemas.email import EmailSchema
-from typing import Dict, Any
+from ..utils.routing import JSONBodyRoute
 
-router = APIRouter(prefix="/api/email", tags=["Email"])
+router = APIRouter(prefix="/api/email", tags=["Email"], route_class=JSONBodyRoute)
 
-@router.post("/send", response_model=Dict[str, Any])
+@router.post("/send")
 async def send_email(email_data: EmailSchema):
     """
     Endpoint to send an email
@@ -2,18 +2,21 @@
 Fulfillment API endpoints module.
 This module handles all API operations related to order fulfillment and shipping.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body, Header, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
+from operator import itemgetter
 
-from app.middleware.auth import get_current_user, require_permission
+from app.middleware.auth import get_current_user, require_permission, STAFF_ROLES
 from app.schemas.fulfillment import (
-    FulfillmentRequest, FulfillmentStatusUpdate, ShippingInfo,
+    FulfillmentRequest, FulfillmentStatus, FulfillmentStatusUpdate, FulfillmentValidationOverride, ShippingInfo,
     Fulfillment, PickList, PackingSlip,
     FulfillmentMetricsReport, FulfillmentPerformanceReport, 
     FulfillmentExceptionReport, FulfillmentReportFilters,
-    ReportSchedule, ReportExportRequest
+    ReportSchedule, ReportExportRequest, ReportJobStatus
 )
 from app.schemas.order import (
     ShippingCalculationRequest, ShippingCalculationResponse,
@@ -21,37 +24,80 @@ from app.schemas.order import (
 )
 from app.services.shipping_service import (
     calculate_shipping_cost, get_shipping_methods,
-    get_shipping_method_by_id, apply_shipping_to_order
+    get_shipping_method_by_id, apply_shipping_to_order,
+    SHIPPING_METHODS_ETAG
 )
-from app.services.order_service import get_order_by_id
+from app.services.order_service import get_order_fulfillment_fields
 from app.services.fulfillment_service import generate_producer_pick_list, generate_order_packing_slip, get_orders_by_producer, update_fulfillment_status, get_fulfillment_history
 from app.services.validation_service import (
     validate_fulfillment_prerequisites,
     override_validation
 )
+from app.utils.response import PydanticJSONResponse, etag_matches
 from app.services.reporting_service import (
-    generate_metrics_report, generate_performance_report,
-    generate_exception_report, export_report, schedule_report
+    start_report_job, get_report_job_result, export_report, schedule_report
 )
 
 
 router = APIRouter()
 
+# Shared dependency markers, built once at import instead of once per route
+_DEP_USER = Depends(get_current_user)
+_DEP_UPDATE_ORDERS = Depends(require_permission("update:orders"))
+_DEP_READ_FULFILLMENT = Depends(require_permission("read:fulfillment"))
+_DEP_UPDATE_FULFILLMENT = Depends(require_permission("update:fulfillment"))
+_DEP_ADMIN = Depends(require_permission("admin"))
+_DEP_READ_REPORTS = Depends(require_permission("read:reports"))
+_DEP_MANAGE_REPORTS = Depends(require_permission("manage:reports"))
+
+# Response serializers built once at import and reused for every request
+SHIPPING_METHOD_LIST_ADAPTER = TypeAdapter(List[ShippingMethod])
+RECORD_LIST_ADAPTER = TypeAdapter(List[Dict[str, Any]])
+
+# Response keys of the fulfillment details endpoint, and a getter for the
+# matching order columns (get_order_fulfillment_fields selects all of them)
+_FULFILLMENT_DETAIL_KEYS = (
+    "order_id", "status", "fulfillment_status", "shipping_method_id", "shipping_cost",
+    "shipping_carrier", "tracking_number", "estimated_delivery_date", "shipping_address",
+    "customer_id"
+)
+_get_fulfillment_fields = itemgetter(
+    "id", "status", "fulfillment_status", "shipping_method_id", "shipping_cost",
+    "shipping_carrier", "tracking_number", "estimated_delivery_date", "shipping_address",
+    "customer_id"
+)
+
+# Shipping methods rarely change, so let clients revalidate with the ETag.
+# The responses depend on authentication, so they must not be shared caches.
+SHIPPING_CACHE_HEADERS = {
+    "ETag": SHIPPING_METHODS_ETAG,
+    "Cache-Control": "private, max-age=60, stale-while-revalidate=300"
+}
+
 
 @router.get("/shipping/methods", response_model=List[ShippingMethod])
 async def list_shipping_methods(
-    current_user: Dict = Depends(get_current_user)
+    if_none_match: Optional[str] = Header(None),
+    current_user: Dict = _DEP_USER
 ):
     """
     Get available shipping methods.
     """
-    return await get_shipping_methods()
+    if etag_matches(if_none_match, SHIPPING_METHODS_ETAG):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=SHIPPING_CACHE_HEADERS)
+    
+    return PydanticJSONResponse(
+        await get_shipping_methods(),
+        adapter=SHIPPING_METHOD_LIST_ADAPTER,
+        headers=SHIPPING_CACHE_HEADERS
+    )
 
 
 @router.get("/shipping/methods/{method_id}", response_model=ShippingMethod)
 async def get_shipping_method(
     method_id: str = Path(..., description="The ID of the shipping method"),
-    current_user: Dict = Depends(get_current_user)
+    if_none_match: Optional[str] = Header(None),
+    current_user: Dict = _DEP_USER
 ):
     """
     Get details for a specific shipping method.
@@ -62,13 +108,17 @@ async def get_shipping_method(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Shipping method with ID '{method_id}' not found"
         )
-    return method
+    
+    if etag_matches(if_none_match, SHIPPING_METHODS_ETAG):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=SHIPPING_CACHE_HEADERS)
+    
+    return PydanticJSONResponse(method, headers=SHIPPING_CACHE_HEADERS)
 
 
 @router.post("/shipping/calculate", response_model=ShippingCalculationResponse)
 async def calculate_shipping(
     request: ShippingCalculationRequest,
-    current_user: Dict = Depends(get_current_user)
+    current_user: Dict = _DEP_USER
 ):
     """
     Calculate shipping costs for given items and shipping address.
@@ -77,66 +127,52 @@ async def calculate_shipping(
     return await calculate_shipping_cost(request)
 
 
-@router.post("/orders/{order_id}/shipping", response_model=Dict)
+@router.post("/orders/{order_id}/shipping")
 async def apply_shipping_method(
     order_id: UUID = Path(..., description="The ID of the order"),
     method_id: str = Query(..., description="The ID of the shipping method to apply"),
-    current_user: Dict = Depends(require_permission("update:orders"))
+    current_user: Dict = _DEP_UPDATE_ORDERS
 ):
     """
     Apply a shipping method to an order.
     Updates the order with shipping details.
     Requires update:orders permission.
     """
-    user_id = UUID(current_user["id"])
+    user_id = current_user["id_uuid"]
     
-    # First check if order exists
-    await get_order_by_id(order_id)
-    
-    # Apply shipping method to order
+    # Apply shipping method to order; this returns 404 if the order doesn't exist
     return await apply_shipping_to_order(order_id, method_id, user_id)
 
 
-@router.get("/orders/{order_id}", response_model=Dict)
+@router.get("/orders/{order_id}")
 async def get_fulfillment_details(
     order_id: UUID = Path(..., description="The ID of the order"),
-    current_user: Dict = Depends(get_current_user)
+    current_user: Dict = _DEP_USER
 ):
     """
     Get fulfillment details for an order.
     """
-    # Get the order with all details
-    order = await get_order_by_id(order_id)
+    # Get only the order columns this endpoint returns
+    order = await get_order_fulfillment_fields(order_id)
     
     # Check permissions (only staff or order owner can view)
-    user_id = UUID(current_user["id"])
-    user_role = current_user.get("role", "").lower()
+    user_role = current_user["role"]
     
-    if str(order["customer_id"]) != str(user_id) and user_role not in ["admin", "staff"]:
+    if user_role not in STAFF_ROLES and order["customer_id"] != current_user["id"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to view this order's fulfillment details"
         )
     
-    # Return fulfillment-related fields from the order
-    return {
-        "order_id": order["id"],
-        "status": order.get("status"),
-        "fulfillment_status": order.get("fulfillment_status", "pending"),
-        "shipping_method_id": order.get("shipping_method_id"),
-        "shipping_cost": order.get("shipping_cost"),
-        "shipping_carrier": order.get("shipping_carrier"),
-        "tracking_number": order.get("tracking_number"),
-        "estimated_delivery_date": order.get("estimated_delivery_date"),
-        "shipping_address": order.get("shipping_address"),
-        "customer_id": order.get("customer_id")
-    }
+    # Return fulfillment-related fields from the order. The values come
+    # straight from the database row, so skip response_model processing.
+    return ORJSONResponse(dict(zip(_FULFILLMENT_DETAIL_KEYS, _get_fulfillment_fields(order))))
 
 
 @router.get("/picklist/producer/{producer_id}", response_model=PickList)
 async def generate_producer_pick_list_endpoint(
     producer_id: UUID = Path(..., description="The ID of the producer"),
-    current_user: Dict = Depends(require_permission("read:fulfillment"))
+    current_user: Dict = _DEP_READ_FULFILLMENT
 ):
     """
     Generate a pick list for a specific producer.
@@ -146,13 +182,13 @@ async def generate_producer_pick_list_endpoint(
     The pick list is optimized for efficient picking by grouping items by product
     and sorting by warehouse location.
     """
-    return await generate_producer_pick_list(producer_id)
+    return PydanticJSONResponse(await generate_producer_pick_list(producer_id))
 
 
 @router.get("/packingslip/order/{order_id}", response_model=PackingSlip)
 async def generate_order_packing_slip_endpoint(
     order_id: UUID = Path(..., description="The ID of the order"),
-    current_user: Dict = Depends(require_permission("read:fulfillment"))
+    current_user: Dict = _DEP_READ_FULFILLMENT
 ):
     """
     Generate a packing slip for a specific order.
@@ -161,13 +197,13 @@ async def generate_order_packing_slip_endpoint(
     For MVP, this is a simplified implementation.
     Future versions will include branded templates and more customization.
     """
-    return await generate_order_packing_slip(order_id)
+    return PydanticJSONResponse(await generate_order_packing_slip(order_id))
 
 
-@router.get("/orders/{order_id}/validate", response_model=Dict[str, Any])
+@router.get("/orders/{order_id}/validate")
 async def validate_order_for_fulfillment(
     order_id: UUID = Path(..., description="The ID of the order to validate"),
-    current_user: Dict = Depends(require_permission("update:fulfillment"))
+    current_user: Dict = _DEP_UPDATE_FULFILLMENT
 ):
     """
     Validate an order to check if it's ready for fulfillment.
@@ -178,11 +214,11 @@ async def validate_order_for_fulfillment(
     return validation_report
 
 
-@router.post("/orders/{order_id}/validate/override", response_model=Dict[str, Any])
+@router.post("/orders/{order_id}/validate/override")
 async def override_fulfillment_validation(
+    override: FulfillmentValidationOverride,
     order_id: UUID = Path(..., description="The ID of the order"),
-    override_reason: str = Body(..., embed=True, description="Reason for overriding validation"),
-    current_user: Dict = Depends(require_permission("admin"))
+    current_user: Dict = _DEP_ADMIN
 ):
     """
     Override validation checks for an order to allow fulfillment despite validation failures.
@@ -200,8 +236,8 @@ async def override_fulfillment_validation(
         }
     
     # Apply the override
-    user_id = UUID(current_user["id"])
-    updated_report = await override_validation(validation_report, user_id, override_reason)
+    user_id = current_user["id_uuid"]
+    updated_report = await override_validation(validation_report, user_id, override.override_reason)
     
     return {
         "message": "Validation checks have been overridden.",
@@ -209,32 +245,30 @@ async def override_fulfillment_validation(
     }
 
 
-@router.patch("/orders/{order_id}/status", response_model=Dict)
+@router.patch("/orders/{order_id}/status")
 async def update_fulfillment_status_endpoint(
     order_id: UUID = Path(..., description="The ID of the order"),
     status_update: FulfillmentStatusUpdate = Body(...),
     skip_validation: bool = Query(False, description="Skip validation checks (admin only)"),
-    current_user: Dict = Depends(require_permission("update:fulfillment"))
+    current_user: Dict = _DEP_UPDATE_FULFILLMENT
 ):
     """
     Update the fulfillment status of an order.
     Performs validation checks before processing unless explicitly skipped.
     Requires update:fulfillment permission.
     """
-    user_id = UUID(current_user["id"])
+    user_id = current_user["id_uuid"]
     
     # Check if user is trying to skip validation but is not an admin
-    if skip_validation:
-        user_role = current_user.get("role", "").lower()
-        if user_role != "admin":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only administrators can skip validation checks"
-            )
+    if skip_validation and current_user["role"] != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can skip validation checks"
+        )
     
     # If transitioning to processing, perform pre-validation for regular users
     # For processing status, perform pre-validation unless admin is skipping
-    if status_update.status == FulfillmentStatus.PROCESSING and not skip_validation:
+    if not skip_validation and status_update.status == FulfillmentStatus.PROCESSING:
         # Run pre-validation
         is_valid, validation_report = await validate_fulfillment_prerequisites(order_id)
         if not is_valid:
@@ -254,48 +288,48 @@ async def update_fulfillment_status_endpoint(
     )
 
 
-@router.get("/orders/{order_id}/history", response_model=List[Dict])
+@router.get("/orders/{order_id}/history")
 async def get_order_fulfillment_history(
     order_id: UUID = Path(..., description="The ID of the order"),
-    current_user: Dict = Depends(require_permission("read:fulfillment"))
+    current_user: Dict = _DEP_READ_FULFILLMENT
 ):
     """
     Get the fulfillment status history for an order.
     Requires read:fulfillment permission.
     """
-    return await get_fulfillment_history(order_id)
+    return PydanticJSONResponse(await get_fulfillment_history(order_id), adapter=RECORD_LIST_ADAPTER)
 
 
-@router.get("/orders/by-producer", response_model=Dict[str, Any])
+@router.get("/orders/by-producer")
 async def get_orders_grouped_by_producer(
     status: Optional[str] = Query(None, description="Filter orders by status (e.g., 'confirmed', 'processing')"),
     fulfillment_status: Optional[str] = Query(None, description="Filter orders by fulfillment status (e.g., 'pending', 'processing')"),
     skip: int = Query(0, description="Number of results to skip for pagination"),
     limit: int = Query(100, description="Maximum number of results to return for pagination"),
-    current_user: Dict = Depends(require_permission("read:fulfillment"))
+    current_user: Dict = _DEP_READ_FULFILLMENT
 ):
     """
     Get orders grouped by producer.
     This endpoint allows for efficient fulfillment by showing which producers have items in which orders.
     Requires read:fulfillment permission.
     """
-    return await get_orders_by_producer(
+    return PydanticJSONResponse(await get_orders_by_producer(
         producer_id=None,
         status=status,
         fulfillment_status=fulfillment_status,
         skip=skip,
         limit=limit
-    )
+    ))
 
 
-@router.get("/orders/by-producer/{producer_id}", response_model=Dict[str, Any])
+@router.get("/orders/by-producer/{producer_id}")
 async def get_orders_for_producer(
     producer_id: UUID = Path(..., description="The ID of the producer"),
     status: Optional[str] = Query(None, description="Filter orders by status (e.g., 'confirmed', 'processing')"),
     fulfillment_status: Optional[str] = Query(None, description="Filter orders by fulfillment status (e.g., 'pending', 'processing')"),
     skip: int = Query(0, description="Number of results to skip for pagination"),
     limit: int = Query(100, description="Maximum number of results to return for pagination"),
-    current_user: Dict = Depends(require_permission("read:fulfillment"))
+    current_user: Dict = _DEP_READ_FULFILLMENT
 ):
     """
     Get orders for a specific producer.
@@ -303,62 +337,123 @@ async def get_orders_for_producer(
     Useful for producer-specific fulfillment operations.
     Requires read:fulfillment permission.
     """
-    return await get_orders_by_producer(
+    return PydanticJSONResponse(await get_orders_by_producer(
         producer_id=producer_id,
         status=status,
         fulfillment_status=fulfillment_status,
         skip=skip,
         limit=limit
-    )
+    ))
 
 
 # ==========================================
 # Fulfillment Reporting Endpoints
 # ==========================================
 
-@router.post("/reports/metrics", response_model=FulfillmentMetricsReport)
+# Documents the 202 that report routes return while a report is generated
+_REPORT_JOB_RESPONSES = {
+    202: {"model": ReportJobStatus, "description": "Report is being generated; poll /reports/jobs/{job_id}"}
+}
+
+
+def _report_response(job_id: str, payload: Optional[bytes]) -> Response:
+    """
+    Build the response for a report request.
+
+    Args:
+        job_id: Report job ID
+        payload: Cached report JSON, or None if it is still being generated
+
+    Returns:
+        The report itself, or a 202 pointing at the job to poll. X-Cache
+        tells clients whether the report was served from the cache.
+    """
+    if payload is not None:
+        return Response(content=payload, media_type="application/json", headers={"X-Cache": "HIT"})
+    return ORJSONResponse(
+        {"status": "pending", "job_id": job_id},
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"X-Cache": "MISS"}
+    )
+
+
+@router.post("/reports/metrics", response_model=FulfillmentMetricsReport, responses=_REPORT_JOB_RESPONSES)
 async def create_metrics_report(
     filters: FulfillmentReportFilters,
-    current_user: Dict = Depends(require_permission("read:reports"))
+    current_user: Dict = _DEP_READ_REPORTS
 ):
     """
     Generate a comprehensive metrics report for fulfillment.
     Includes time metrics, accuracy metrics, cost metrics, and volume metrics.
+    Generated in the background; returns 202 with a job ID until the report is ready.
     Requires read:reports permission.
     """
-    return await generate_metrics_report(filters)
+    return _report_response(*start_report_job("metrics", filters))
 
 
-@router.post("/reports/performance", response_model=FulfillmentPerformanceReport)
+@router.post("/reports/performance", response_model=FulfillmentPerformanceReport, responses=_REPORT_JOB_RESPONSES)
 async def create_performance_report(
     filters: FulfillmentReportFilters,
-    current_user: Dict = Depends(require_permission("read:reports"))
+    current_user: Dict = _DEP_READ_REPORTS
 ):
     """
     Generate a performance report for fulfillment operations.
     Includes producer performance, shipping method performance, and areas for improvement.
+    Generated in the background; returns 202 with a job ID until the report is ready.
     Requires read:reports permission.
     """
-    return await generate_performance_report(filters)
+    return _report_response(*start_report_job("performance", filters))
 
 
-@router.post("/reports/exceptions", response_model=FulfillmentExceptionReport)
+@router.post("/reports/exceptions", response_model=FulfillmentExceptionReport, responses=_REPORT_JOB_RESPONSES)
 async def create_exception_report(
     filters: FulfillmentReportFilters,
-    current_user: Dict = Depends(require_permission("read:reports"))
+    current_user: Dict = _DEP_READ_REPORTS
 ):
     """
     Generate a report on fulfillment exceptions and issues.
     Includes exception types, order exceptions, and resolution metrics.
+    Generated in the background; returns 202 with a job ID until the report is ready.
+    Requires read:reports permission.
+    """
+    return _report_response(*start_report_job("exceptions", filters))
+
+
+@router.get(
+    "/reports/jobs/{job_id}",
+    responses={
+        **_REPORT_JOB_RESPONSES,
+        500: {"model": ReportJobStatus, "description": "Report generation failed"}
+    }
+)
+async def get_report_job(
+    job_id: str = Path(..., description="Job ID returned when the report was requested"),
+    current_user: Dict = _DEP_READ_REPORTS
+):
+    """
+    Get a report that is generated in the background.
+    Returns the report once it is ready, 202 while it is still pending, or
+    500 if generation failed; requesting the report again retries it.
     Requires read:reports permission.
     """
-    return await generate_exception_report(filters)
+    job_status, payload = get_report_job_result(job_id)
+    if job_status is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Report job '{job_id}' not found or expired"
+        )
+    if job_status == "failed":
+        return ORJSONResponse(
+            {"status": "failed", "job_id": job_id, "error": "Report generation failed"},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    return _report_response(job_id, payload)
 
 
 @router.post("/reports/export")
 async def export_report_endpoint(
     export_request: ReportExportRequest,
-    current_user: Dict = Depends(require_permission("read:reports"))
+    current_user: Dict = _DEP_READ_REPORTS
 ):
     """
     Export a report in the specified format.
@@ -376,7 +471,6 @@ async def export_report_endpoint(
     filename = f"fulfillment_report_{export_request.report_id}.{export_request.format.lower()}"
     
     # Return the file as a downloadable response
-    from fastapi.responses import Response
     return Response(
         content=content,
         media_type=content_type,
@@ -386,14 +480,14 @@ async def export_report_endpoint(
     )
 
 
-@router.post("/reports/schedule", response_model=Dict[str, Any])
+@router.post("/reports/schedule")
 async def schedule_report_endpoint(
     report_type: str = Query(..., description="Type of report to schedule: 'metrics', 'performance', or 'exceptions'"),
     frequency: str = Query(..., description="Frequency of report generation: 'daily', 'weekly', or 'monthly'"),
     format: str = Query("json", description="Format to generate the report in: 'json', 'csv', 'pdf', or 'excel'"),
     filters: FulfillmentReportFilters = Body(...),
     recipients: List[Dict[str, Any]] = Body(...),
-    current_user: Dict = Depends(require_permission("manage:reports"))
+    current_user: Dict = _DEP_MANAGE_REPORTS
 ):
     """
     Schedule a report for regular generation and distribution.
@@ -2,11 +2,13 @@
 Orders API endpoints module.
 This module handles all API operations related to orders.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body, Header
+from pydantic import TypeAdapter
+from pydantic_core import to_json
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
-from app.middleware.auth import get_current_user, require_permission
+from app.middleware.auth import get_current_user, require_permission, STAFF_ROLES
 from app.schemas.order import (
     OrderCreate, OrderUpdate, OrderResponse, OrderWithItems, OrderWithDetails,
     OrderNoteCreate, OrderNoteResponse
@@ -19,9 +21,72 @@ from app.services.order_status_service import (
     transition_order_status, get_valid_status_transitions,
     get_status_timeline
 )
+from app.utils.response import PydanticJSONResponse, conditional_json_response
+from app.utils.routing import JSONBodyRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=JSONBodyRoute)
+
+# Validates raw order rows and serializes them in pydantic-core, instead of
+# validating, dumping to dicts and encoding again through response_model
+ORDER_LIST_ADAPTER = TypeAdapter(List[OrderWithItems])
+
+
+def _order_list_response(orders: List[Dict]) -> PydanticJSONResponse:
+    """
+    Build the response for a page of orders.
+
+    Args:
+        orders: Order rows with their items attached
+
+    Returns:
+        JSON response with the orders shaped as OrderWithItems
+    """
+    return PydanticJSONResponse(ORDER_LIST_ADAPTER.validate_python(orders), adapter=ORDER_LIST_ADAPTER)
+
+
+async def load_order(
+    order_id: UUID = Path(...),
+    current_user: Dict = Depends(get_current_user)
+) -> Dict:
+    """
+    Dependency that loads the order named in the path.
+    FastAPI caches dependency results per request, so every dependency and
+    route that asks for it shares a single fetch. Depending on the current
+    user makes authentication run before the order is fetched.
+    
+    Args:
+        order_id: ID of the order
+        current_user: The authenticated user
+        
+    Returns:
+        The order with its items, history, and notes
+    """
+    return await get_order_by_id(order_id)
+
+
+async def get_viewable_order(
+    current_user: Dict = Depends(get_current_user),
+    order: Dict = Depends(load_order)
+) -> Dict:
+    """
+    Dependency that loads the order named in the path and checks that the
+    current user may view it. Users can view their own orders; staff can view any order.
+    
+    Args:
+        current_user: The authenticated user
+        order: The loaded order
+        
+    Returns:
+        The order with its items, history, and notes
+    """
+    if current_user["role"] not in STAFF_ROLES and order["customer_id"] != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to view this order"
+        )
+    
+    return order
 
 
 @router.get("/", response_model=List[OrderWithItems])
@@ -36,7 +101,9 @@ async def list_orders(
     Get a list of orders with pagination and filtering support.
     Requires read:orders permission.
     """
-    return await get_orders(skip=skip, limit=limit, customer_id=customer_id, status=status)
+    return _order_list_response(
+        await get_orders(skip=skip, limit=limit, customer_id=customer_id, status=status)
+    )
 
 
 @router.get("/my", response_model=List[OrderWithItems])
@@ -50,79 +117,46 @@ async def list_my_orders(
     Get a list of the current user's orders with pagination and filtering.
     All authenticated users can view their own orders.
     """
-    user_id = UUID(current_user["id"])
-    return await get_orders(skip=skip, limit=limit, customer_id=user_id, status=status)
+    user_id = current_user["id_uuid"]
+    return _order_list_response(
+        await get_orders(skip=skip, limit=limit, customer_id=user_id, status=status)
+    )
 
 
 @router.get("/{order_id}", response_model=OrderWithDetails)
 async def get_order(
-    order_id: UUID = Path(...),
-    current_user: Dict = Depends(get_current_user)
+    order: Dict = Depends(get_viewable_order)
 ):
     """
     Get a specific order by ID.
     Users can view their own orders. Staff can view any order.
     """
-    order = await get_order_by_id(order_id)
-    
-    # Check if user has permission to view this order
-    user_id = UUID(current_user["id"])
-    user_role = current_user.get("role", "").lower()
-    
-    if str(order["customer_id"]) != str(user_id) and user_role not in ["admin", "staff"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view this order"
-        )
-    
     return order
 
 
-@router.get("/{order_id}/timeline", response_model=List[Dict])
+@router.get("/{order_id}/timeline")
 async def get_order_timeline(
     order_id: UUID = Path(...),
-    current_user: Dict = Depends(get_current_user)
+    if_none_match: Optional[str] = Header(None),
+    order: Dict = Depends(get_viewable_order)
 ):
     """
     Get a timeline of status changes for an order.
     Users can view their own order timeline. Staff can view any order timeline.
+    Supports If-None-Match; an unchanged timeline returns 304.
     """
-    # First check if user has permission to view this order
-    order = await get_order_by_id(order_id)
-    
-    user_id = UUID(current_user["id"])
-    user_role = current_user.get("role", "").lower()
-    
-    if str(order["customer_id"]) != str(user_id) and user_role not in ["admin", "staff"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view this order"
-        )
-    
-    return await get_status_timeline(order_id)
+    timeline = await get_status_timeline(order_id, order)
+    return conditional_json_response(to_json(timeline), if_none_match)
 
 
 @router.get("/{order_id}/status/transitions", response_model=List[str])
 async def get_available_status_transitions(
-    order_id: UUID = Path(...),
-    current_user: Dict = Depends(get_current_user)
+    order: Dict = Depends(get_viewable_order)
 ):
     """
     Get the list of valid status transitions for an order.
     Users can view transitions for their own orders. Staff can view for any order.
     """
-    # First check if user has permission to view this order
-    order = await get_order_by_id(order_id)
-    
-    user_id = UUID(current_user["id"])
-    user_role = current_user.get("role", "").lower()
-    
-    if str(order["customer_id"]) != str(user_id) and user_role not in ["admin", "staff"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view this order"
-        )
-    
     return await get_valid_status_transitions(order["status"])
 
 
@@ -135,11 +169,11 @@ async def create_new_order(
     Create a new order.
     All authenticated users can create orders.
     """
-    user_id = UUID(current_user["id"])
+    user_id = current_user["id_uuid"]
     
     # If customer_id is not the current user and user is not admin/staff, reject
-    user_role = current_user.get("role", "").lower()
-    if str(order_data.customer_id) != str(user_id) and user_role not in ["admin", "staff"]:
+    user_role = current_user["role"]
+    if user_role not in STAFF_ROLES and order_data.customer_id != user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only create orders for yourself"
@@ -152,22 +186,25 @@ async def create_new_order(
 async def update_existing_order(
     order_id: UUID = Path(...),
     order_data: OrderUpdate = Body(...),
-    current_user: Dict = Depends(get_current_user)
+    current_user: Dict = Depends(get_current_user),
+    order: Dict = Depends(load_order)
 ):
     """
     Update an existing order.
     Users can update their own orders' notes. Staff can update any order.
     """
-    user_id = UUID(current_user["id"])
-    user_role = current_user.get("role", "").lower()
-    
-    # Get the order to check ownership
-    order = await get_order_by_id(order_id)
+    user_id = current_user["id_uuid"]
+    user_role = current_user["role"]
     
     # If not owner and not staff, reject unless just updating notes
-    if str(order["customer_id"]) != str(user_id) and user_role not in ["admin", "staff"]:
+    if user_role not in STAFF_ROLES and order["customer_id"] != current_user["id"]:
         # Customers can only update their notes
-        if any(key != "notes" for key in order_data.dict(exclude_none=True).keys()):
+        # Check the explicitly set fields instead of dumping the whole model;
+        # fields sent as null count as unset, as with exclude_none
+        if any(
+            getattr(order_data, field) is not None
+            for field in order_data.model_fields_set - {"notes"}
+        ):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You can only update notes for your own orders"
@@ -180,10 +217,11 @@ async def update_existing_order(
             new_status=order_data.status,
             user_id=user_id,
             user_role=user_role,
-            notes=order_data.notes
+            notes=order_data.notes,
+            order=order
         )
     
-    return await update_order(order_id, order_data, user_id)
+    return await update_order(order_id, order_data, user_id, current_order=order)
 
 
 @router.patch("/{order_id}/status", response_model=OrderWithDetails)
@@ -196,8 +234,8 @@ async def update_order_status_endpoint(
     Update an order's status.
     Uses the order status management service to validate transitions.
     """
-    user_id = UUID(current_user["id"])
-    user_role = current_user.get("role", "").lower()
+    user_id = current_user["id_uuid"]
+    user_role = current_user["role"]
     new_status = status_data.get("status")
     notes = status_data.get("notes")
     
@@ -220,28 +258,26 @@ async def update_order_status_endpoint(
 async def add_note_to_order(
     order_id: UUID = Path(...),
     note_data: OrderNoteCreate = Body(...),
-    current_user: Dict = Depends(get_current_user)
+    current_user: Dict = Depends(get_current_user),
+    order: Dict = Depends(load_order)
 ):
     """
     Add a note to an order.
     Users can add notes to their own orders. Staff can add notes to any order.
     Staff can add internal notes.
     """
-    user_id = UUID(current_user["id"])
-    user_role = current_user.get("role", "").lower()
-    
-    # Get the order to check ownership
-    order = await get_order_by_id(order_id)
+    user_id = current_user["id_uuid"]
+    user_role = current_user["role"]
     
     # If not owner and not staff, reject
-    if str(order["customer_id"]) != str(user_id) and user_role not in ["admin", "staff"]:
+    if user_role not in STAFF_ROLES and order["customer_id"] != current_user["id"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only add notes to your own orders"
         )
     
     # If not staff, ensure is_internal is false
-    if user_role not in ["admin", "staff"] and note_data.is_internal:
+    if user_role not in STAFF_ROLES and note_data.is_internal:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You cannot create internal notes"
@@ -273,8 +309,8 @@ async def cancel_order_endpoint(
     Cancel an order.
     Users can cancel their own orders. Staff can cancel any order.
     """
-    user_id = UUID(current_user["id"])
-    user_role = current_user.get("role", "").lower()
+    user_id = current_user["id_uuid"]
+    user_role = current_user["role"]
     
     reason = cancel_data.get("reason", "No reason provided")
     notes = f"Order cancelled. Reason: {reason}"
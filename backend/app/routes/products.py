@@ -2,24 +2,41 @@
 Products API endpoints module.
 This module handles all API operations related to products.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body, Header
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
 from typing import List, Dict, Optional
 from uuid import UUID
 from app.middleware.auth import get_current_user, require_permission
 from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
 from app.services import product_service
+from app.utils.cache import TTLCache
+from app.utils.response import conditional_json_response
 
 router = APIRouter()
 
+# Validates raw product rows and serializes them in a single pydantic-core pass
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[ProductResponse])
+
+# Serialized category list, shared by every request until it expires or a
+# category or product route changes it. Other workers pick up changes within
+# the TTL.
+CATEGORIES_CACHE_TTL_SECONDS = 60
+_CATEGORIES_KEY = "categories"
+_categories_cache = TTLCache(maxsize=1, ttl=CATEGORIES_CACHE_TTL_SECONDS)
+
 @router.get("/", response_model=List[ProductResponse])
 async def get_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     category: Optional[str] = Query(None, description="Filter by category"),
+    if_none_match: Optional[str] = Header(None),
     current_user: Dict = Depends(require_permission("read:products"))
 ):
     """
     Get a list of products with pagination support.
+    Supports If-None-Match; an unchanged page returns 304.
     Requires read:products permission.
     """
     filters = {}
@@ -28,13 +45,56 @@ async def get_products(
     
     try:
         products = await product_service.get_products(skip, limit, filters)
-        return products
+        body = PRODUCT_LIST_ADAPTER.dump_json(PRODUCT_LIST_ADAPTER.validate_python(products))
+        return conditional_json_response(body, if_none_match)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving products: {str(e)}"
         )
 
+# Static GET paths are declared before /{product_id}, which would otherwise
+# capture them and reject them as invalid UUIDs
+@router.get("/inventory")
+async def get_inventory(
+    current_user: Dict = Depends(require_permission("read:inventory"))
+):
+    """
+    Get current inventory levels for all products.
+    Requires read:inventory permission.
+    """
+    try:
+        # Rows come straight from PostgREST JSON, so orjson can encode them as-is
+        inventory = await product_service.get_inventory()
+        return ORJSONResponse(inventory)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving inventory: {str(e)}"
+        )
+
+@router.get("/categories", response_model=List[str])
+async def get_categories(
+    if_none_match: Optional[str] = Header(None),
+    current_user: Dict = Depends(require_permission("read:products"))
+):
+    """
+    Get all product categories.
+    Supports If-None-Match; an unchanged list returns 304.
+    Requires read:products permission.
+    """
+    try:
+        body = _categories_cache.get(_CATEGORIES_KEY)
+        if body is None:
+            body = to_json(await product_service.get_categories())
+            _categories_cache.set(_CATEGORIES_KEY, body)
+        return conditional_json_response(body, if_none_match)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving categories: {str(e)}"
+        )
+
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
     product_id: UUID = Path(...),
@@ -71,10 +131,12 @@ async def create_product(
     """
     try:
         # Add producer_id from the current user
-        product_dict = product_data.dict()
+        product_dict = product_data.model_dump()
         product_dict["producer_id"] = current_user["id"]
         
         new_product = await product_service.create_product(product_dict)
+        # Categories may be derived from product rows, so refresh them too
+        _categories_cache.clear()
         return new_product
     except Exception as e:
         raise HTTPException(
@@ -102,15 +164,16 @@ async def update_product(
             )
         
         # Only allow update if user is the producer or has admin rights
-        if existing_product["producer_id"] != current_user["id"] and "admin" not in current_user.get("roles", []):
+        if current_user["role"] != "admin" and existing_product["producer_id"] != current_user["id"]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to update this product"
             )
         
         # Update product
-        product_dict = product_data.dict(exclude_unset=True)
+        product_dict = product_data.model_dump(exclude_unset=True)
         updated_product = await product_service.update_product(product_id, product_dict)
+        _categories_cache.clear()
         return updated_product
     except HTTPException:
         raise
@@ -139,7 +202,7 @@ async def delete_product(
             )
         
         # Only allow deletion if user is the producer or has admin rights
-        if existing_product["producer_id"] != current_user["id"] and "admin" not in current_user.get("roles", []):
+        if current_user["role"] != "admin" and existing_product["producer_id"] != current_user["id"]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to delete this product"
@@ -147,6 +210,7 @@ async def delete_product(
         
         # Delete product
         await product_service.delete_product(product_id)
+        _categories_cache.clear()
         return None
     except HTTPException:
         raise
@@ -156,24 +220,7 @@ async def delete_product(
             detail=f"Error deleting product: {str(e)}"
         )
 
-@router.get("/inventory", response_model=List[Dict])
-async def get_inventory(
-    current_user: Dict = Depends(require_permission("read:inventory"))
-):
-    """
-    Get current inventory levels for all products.
-    Requires read:inventory permission.
-    """
-    try:
-        inventory = await product_service.get_inventory()
-        return inventory
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error retrieving inventory: {str(e)}"
-        )
-
-@router.post("/inventory/adjust", response_model=Dict)
+@router.post("/inventory/adjust")
 async def adjust_inventory(
     product_id: UUID = Body(...),
     quantity: int = Body(...),
@@ -198,23 +245,6 @@ async def adjust_inventory(
         )
 
 # Category Management Endpoints
-@router.get("/categories", response_model=List[str])
-async def get_categories(
-    current_user: Dict = Depends(require_permission("read:products"))
-):
-    """
-    Get all product categories.
-    Requires read:products permission.
-    """
-    try:
-        categories = await product_service.get_categories()
-        return categories
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error retrieving categories: {str(e)}"
-        )
-
 @router.post("/categories", response_model=str, status_code=status.HTTP_201_CREATED)
 async def create_category(
     category_data: Dict = Body(..., example={"name": "Electronics"}),
@@ -232,6 +262,7 @@ async def create_category(
             )
         
         category_name = await product_service.create_category(category_data["name"])
+        _categories_cache.clear()
         return category_name
     except HTTPException:
         raise
@@ -259,6 +290,7 @@ async def update_category(
             )
         
         updated_name = await product_service.update_category(category_name, category_data["name"])
+        _categories_cache.clear()
         return updated_name
     except ValueError as e:
         raise HTTPException(
@@ -282,6 +314,7 @@ async def delete_category(
     """
     try:
         await product_service.delete_category(category_name)
+        _categories_cache.clear()
         return None
     except ValueError as e:
         raise HTTPException(
@@ -1,38 +1,118 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
-from app.schemas.user import UserCreate, UserUpdate, UserResponse, ProducerProfileUpdate, ProducerProfileResponse, UserWithProfile
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Header
+from app.schemas.user import UserCreate, UserUpdate, UserResponse, ProducerProfileUpdate, ProducerProfileResponse, UserWithProfile, UserRoleUpdate
 from app.services import user_service
 from app.middleware.auth import get_current_user, require_permission, require_role
-from typing import Dict, List, Optional
+from app.utils.response import PydanticJSONResponse, conditional_json_response
+from pydantic import TypeAdapter
+from typing import Any, Dict, List, Optional
 from uuid import UUID
+import asyncio
 
 router = APIRouter(
     prefix="/users",
     tags=["users"]
 )
 
+# Validate raw rows and serialize them in pydantic-core, instead of going
+# through the response_model round trip and jsonable_encoder
+USER_LIST_ADAPTER = TypeAdapter(List[UserResponse])
+USER_WITH_PROFILE_ADAPTER = TypeAdapter(UserWithProfile)
+USER_ADAPTER = TypeAdapter(UserResponse)
+PROFILE_ADAPTER = TypeAdapter(ProducerProfileResponse)
+
+
+def _conditional_response(adapter: TypeAdapter, data: Any, if_none_match: Optional[str]):
+    """
+    Serialize a record through its adapter and tag it with an ETag.
+    
+    Args:
+        adapter: TypeAdapter for the response model
+        data: Raw record to validate and serialize
+        if_none_match: Value of the If-None-Match request header, if any
+        
+    Returns:
+        A 200 response with the body, or a 304 if the client's copy is current
+    """
+    return conditional_json_response(adapter.dump_json(adapter.validate_python(data)), if_none_match)
+
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(user_data: UserCreate):
-    try:
-        # Check if user with email already exists
-        existing_user = await user_service.get_user_by_email(user_data.email)
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="User with this email already exists"
-            )
-        
-        return await user_service.create_user(user_data)
-    except Exception as e:
+    # Check if user with email already exists
+    if await user_service.email_exists(user_data.email):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User with this email already exists"
+        )
+    
+    return await user_service.create_user(user_data)
+
+
+# The /me routes are declared before /{user_id}, which would otherwise
+# capture them and reject "me" as an invalid UUID
+@router.get("/me", response_model=UserResponse)
+async def get_my_profile(
+    if_none_match: Optional[str] = Header(None),
+    current_user: Dict = Depends(get_current_user)
+):
+    """
+    Get the profile of the currently authenticated user.
+    Supports If-None-Match; an unchanged profile returns 304.
+    """
+    # The token only carries identity claims, so load the full row
+    user = await user_service.get_user_by_id(current_user["id_uuid"])
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return _conditional_response(USER_ADAPTER, user, if_none_match)
+
+
+@router.put("/me", response_model=UserResponse)
+async def update_my_profile(
+    user_data: UserUpdate,
+    current_user: Dict = Depends(get_current_user)
+):
+    """
+    Update the profile of the currently authenticated user.
+    """
+    return await user_service.update_user(current_user["id_uuid"], user_data)
+
+
+@router.get("/me/profile", response_model=ProducerProfileResponse)
+async def get_my_producer_profile(
+    if_none_match: Optional[str] = Header(None),
+    current_user: Dict = Depends(get_current_user)
+):
+    """
+    Get the producer profile of the currently authenticated user.
+    Supports If-None-Match; an unchanged profile returns 304.
+    """
+    profile = await user_service.get_producer_profile(current_user["id_uuid"])
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Producer profile not found"
         )
+    return _conditional_response(PROFILE_ADAPTER, profile, if_none_match)
+
+
+@router.put("/me/profile", response_model=ProducerProfileResponse)
+async def update_my_producer_profile(
+    profile_data: ProducerProfileUpdate,
+    current_user: Dict = Depends(get_current_user)
+):
+    """
+    Update the producer profile of the currently authenticated user.
+    """
+    return await user_service.update_producer_profile(current_user["id_uuid"], profile_data)
 
 
 @router.get("/{user_id}", response_model=UserWithProfile)
 async def get_user(
     user_id: UUID,
+    if_none_match: Optional[str] = Header(None),
     current_user: Dict = Depends(require_permission("read:users"))
 ):
     user = await user_service.get_user_with_profile(user_id)
@@ -42,7 +122,7 @@ async def get_user(
             detail="User not found"
         )
     
-    return user
+    return _conditional_response(USER_WITH_PROFILE_ADAPTER, user, if_none_match)
 
 
 @router.put("/{user_id}", response_model=UserResponse)
@@ -64,6 +144,7 @@ async def update_user(
 @router.get("/{user_id}/profile", response_model=ProducerProfileResponse)
 async def get_producer_profile(
     user_id: UUID,
+    if_none_match: Optional[str] = Header(None),
     current_user: Dict = Depends(require_permission("read:users"))
 ):
     profile = await user_service.get_producer_profile(user_id)
@@ -73,7 +154,7 @@ async def get_producer_profile(
             detail="Producer profile not found"
         )
     
-    return profile
+    return _conditional_response(PROFILE_ADAPTER, profile, if_none_match)
 
 
 @router.put("/{user_id}/profile", response_model=ProducerProfileResponse)
@@ -82,14 +163,17 @@ async def update_producer_profile(
     profile_data: ProducerProfileUpdate,
     current_user: Dict = Depends(require_permission("update:users"))
 ):
-    user = await user_service.get_user_by_id(user_id)
+    # Both lookups only need the ID, so run them together
+    user, profile = await asyncio.gather(
+        user_service.get_user_by_id(user_id),
+        user_service.get_producer_profile(user_id)
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    profile = await user_service.get_producer_profile(user_id)
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -101,127 +185,58 @@ async def update_producer_profile(
 
 @router.get("", response_model=List[UserResponse])
 async def get_users(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     limit: int = Query(100, ge=1, le=100),
     current_user: Dict = Depends(require_permission("read:users"))
 ):
     """
-    Get a list of all users. Requires read:users permission.
-    """
-    try:
-        # Get all users from Supabase
-        response = user_service.supabase.table("users").select("*").range(skip, skip + limit).execute()
-        
-        return response.data
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
-
-
-@router.get("/me", response_model=UserResponse)
-async def get_my_profile(current_user: Dict = Depends(get_current_user)):
-    """
-    Get the profile of the currently authenticated user.
-    """
-    return current_user
-
-
-@router.put("/me", response_model=UserResponse)
-async def update_my_profile(
-    user_data: UserUpdate,
-    current_user: Dict = Depends(get_current_user)
-):
-    """
-    Update the profile of the currently authenticated user.
-    """
-    try:
-        updated_user = await user_service.update_user(UUID(current_user["id"]), user_data)
-        return updated_user
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
-
-
-@router.get("/me/profile", response_model=ProducerProfileResponse)
-async def get_my_producer_profile(current_user: Dict = Depends(get_current_user)):
-    """
-    Get the producer profile of the currently authenticated user.
-    """
-    try:
-        profile = await user_service.get_producer_profile(UUID(current_user["id"]))
-        if not profile:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Producer profile not found"
-            )
-        return profile
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
-
-
-@router.put("/me/profile", response_model=ProducerProfileResponse)
-async def update_my_producer_profile(
-    profile_data: ProducerProfileUpdate,
-    current_user: Dict = Depends(get_current_user)
-):
-    """
-    Update the producer profile of the currently authenticated user.
+    Get a page of users, newest first. Requires read:users permission.
+    When more users follow, the X-Next-Cursor header holds the cursor for the next page.
     """
     try:
-        updated_profile = await user_service.update_producer_profile(UUID(current_user["id"]), profile_data)
-        return updated_profile
-    except Exception as e:
+        users, next_cursor = await user_service.list_users(limit, cursor)
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return PydanticJSONResponse(
+        USER_LIST_ADAPTER.validate_python(users),
+        adapter=USER_LIST_ADAPTER,
+        headers=headers
+    )
 
 
 @router.put("/{user_id}/role", response_model=UserResponse)
 async def update_user_role(
-    role: str = Body(..., embed=True),
+    role_update: UserRoleUpdate,
     user_id: UUID = Path(...),
     current_user: Dict = Depends(require_role("admin"))
 ):
     """
     Update a user's role. Admin access only.
     """
-    try:
-        # Validate role
-        valid_roles = ["admin", "producer", "staff"]
-        if role not in valid_roles:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid role. Must be one of: {', '.join(valid_roles)}"
-            )
-        
-        # Get the user to update
-        user = await user_service.get_user_by_id(user_id)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        # Update the role in the database
-        updated_user = await user_service.update_user_role(user_id, role)
-        return updated_user
-    except HTTPException:
-        raise
-    except Exception as e:
+    role = role_update.role
+
+    # Validate role
+    valid_roles = ["admin", "producer", "staff"]
+    if role not in valid_roles:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid role. Must be one of: {', '.join(valid_roles)}"
+        )
+    
+    # Update the role in the database; no row back means no such user
+    updated_user = await user_service.update_user_role(user_id, role)
+    if not updated_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
         )
+    
+    return updated_user
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -232,24 +247,12 @@ async def delete_user(
     """
     Delete a user. Requires delete:users permission.
     """
-    try:
-        # Get the user to delete
-        user = await user_service.get_user_by_id(user_id)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        # Delete the user from the database
-        await user_service.delete_user(user_id)
-        
-        # No content response
-        return None
-    except HTTPException:
-        raise
-    except Exception as e:
+    # Delete the user from the database; nothing deleted means no such user
+    if not await user_service.delete_user(user_id):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        ) 
\ No newline at end of file
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    # No content response
+    return None
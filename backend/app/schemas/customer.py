@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, HttpUrl
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from uuid import UUID
@@ -52,8 +52,7 @@ class CustomerResponse(CustomerBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Alias classes for Producer endpoints (same data structure, different naming)
@@ -89,8 +88,7 @@ class ProducerPreferencesResponse(ProducerPreferencesBase):
     producer_id: UUID
     updated_at: datetime
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProducerNoteBase(BaseModel):
@@ -107,13 +105,11 @@ class ProducerNoteResponse(ProducerNoteBase):
     created_by: UUID
     created_at: datetime
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProducerWithDetails(ProducerResponse):
     notes: Optional[List[ProducerNoteResponse]] = []
     preferences: Optional[ProducerPreferencesResponse] = None
     
-    class Config:
-        orm_mode = True 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Schemas for fulfillment-related data models
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any, List
 from decimal import Decimal
 from datetime import datetime
@@ -83,6 +83,11 @@ class FulfillmentStatusUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class FulfillmentValidationOverride(BaseModel):
+    """Request to override failed validation checks for an order"""
+    override_reason: str = Field(..., description="Reason for overriding validation")
+
+
 class ShippingInfo(BaseModel):
     """Shipping information for a fulfillment"""
     carrier: str
@@ -107,8 +112,7 @@ class Fulfillment(BaseModel):
     pick_list_id: Optional[UUID] = None
     packing_slip_id: Optional[UUID] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Fulfillment Reporting Schemas
@@ -221,6 +225,13 @@ class ReportSchedule(BaseModel):
     last_generated: Optional[datetime] = None
 
 
+class ReportJobStatus(BaseModel):
+    """State of a report that is generated in the background"""
+    status: str  # "pending", "failed"
+    job_id: str
+    error: Optional[str] = None
+
+
 class ReportExportRequest(BaseModel):
     """Request to export a report in a specific format"""
     report_id: UUID
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any, List
 from decimal import Decimal
 from datetime import datetime
@@ -24,8 +24,7 @@ class OrderItemResponse(OrderItemBase):
     order_id: UUID
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrderNoteBase(BaseModel):
@@ -43,8 +42,7 @@ class OrderNoteResponse(OrderNoteBase):
     user_id: Optional[UUID] = None
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrderHistoryBase(BaseModel):
@@ -63,8 +61,7 @@ class OrderHistoryResponse(OrderHistoryBase):
     changed_by: Optional[UUID] = None
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # New schema for shipping methods
@@ -135,8 +132,7 @@ class OrderResponse(OrderBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrderWithItems(OrderResponse):
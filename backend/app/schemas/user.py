@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
@@ -19,14 +19,30 @@ class UserUpdate(BaseModel):
     company_name: Optional[str] = None
 
 
+class PasswordResetRequest(BaseModel):
+    email: str
+
+
+class PasswordUpdate(BaseModel):
+    current_password: str
+    new_password: str
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+
+class UserRoleUpdate(BaseModel):
+    role: str
+
+
 class UserResponse(UserBase):
     id: UUID
     role: str
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProducerProfileBase(BaseModel):
@@ -54,8 +70,7 @@ class ProducerProfileResponse(ProducerProfileBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserWithProfile(UserResponse):
@@ -3,7 +3,9 @@ from uuid import UUID
 import json
 import asyncio
 from datetime import datetime
+from urllib.parse import urlparse
 from fastapi import HTTPException
+from pydantic import EmailStr, TypeAdapter, ValidationError as PydanticValidationError
 
 from app.models.customer import (
     CustomerCreate, CustomerUpdate, CustomerWithDetails, Customer, 
@@ -12,11 +14,22 @@ from app.models.customer import (
 )
 from app.models.order import Order
 from app.utils.logging import setup_logger
+from app.utils.errors import ValidationError
 from app.utils.db import execute_query, fetch_one, fetch_all
 from app.utils.db_queries import generate_update_query
 
 logger = setup_logger(__name__)
 
+# List validators built once, so whole result sets are validated in a single
+# pydantic-core call instead of one model_validate call per row
+_customer_list = TypeAdapter(List[Customer])
+_customer_note_list = TypeAdapter(List[CustomerNote])
+_customer_note = TypeAdapter(CustomerNote)
+_order_list = TypeAdapter(List[Order])
+
+# Email check for updates, built once; the same EmailStr rules as creation
+_email = TypeAdapter(EmailStr)
+
 
 async def get_customers(
     skip: int = 0, 
@@ -87,7 +100,7 @@ async def get_customers(
     params.extend([skip, limit])
     
     customers_data = await fetch_all(query, params)
-    return [Customer.parse_obj(customer) for customer in customers_data]
+    return _customer_list.validate_python(customers_data)
 
 
 async def get_producers(
@@ -102,60 +115,48 @@ async def get_producers(
     """
     # Reuse get_customers function with producer-specific filters
     customers = await get_customers(skip, limit, search, None, producer_type, is_active)
-    # Convert to Producer model for API consistency
-    return [Producer.parse_obj(customer.dict()) for customer in customers]
+    # Producer is an alias of Customer, so no conversion is needed
+    return customers
 
 
 async def get_customer_by_id(customer_id: UUID) -> Optional[CustomerWithDetails]:
     """
     Get a specific customer by ID with details.
     """
-    # Get customer basic information
+    # Get customer with notes and preferences embedded in a single round-trip
     query = """
     SELECT 
-        id, email, full_name, phone, address, postal_code, city, customer_type, 
-        business_name, business_id, producer_type, website, description, is_active,
-        created_at, updated_at
+        c.id, c.email, c.full_name, c.phone, c.address, c.postal_code, c.city, c.customer_type, 
+        c.business_name, c.business_id, c.producer_type, c.website, c.description, c.is_active,
+        c.created_at, c.updated_at,
+        COALESCE((
+            SELECT json_agg(n ORDER BY n.created_at DESC)
+            FROM (
+                SELECT id, customer_id, content, created_by, created_at
+                FROM customer_notes
+                WHERE customer_id = c.id
+            ) n
+        ), '[]'::json) AS notes,
+        (
+            SELECT row_to_json(p)
+            FROM (
+                SELECT customer_id, preferences, updated_at
+                FROM customer_preferences
+                WHERE customer_id = c.id
+            ) p
+        ) AS preferences
     FROM 
-        customers 
+        customers c 
     WHERE 
-        id = $1
+        c.id = $1
     """
     customer_data = await fetch_one(query, [customer_id])
     
     if not customer_data:
         return None
     
-    # Get customer notes
-    notes_query = """
-    SELECT 
-        id, customer_id, content, created_by, created_at 
-    FROM 
-        customer_notes 
-    WHERE 
-        customer_id = $1
-    ORDER BY 
-        created_at DESC
-    """
-    notes_data = await fetch_all(notes_query, [customer_id])
-    notes = [CustomerNote.parse_obj(note) for note in notes_data]
-    
-    # Get customer preferences
-    prefs_query = """
-    SELECT 
-        customer_id, preferences, updated_at 
-    FROM 
-        customer_preferences 
-    WHERE 
-        customer_id = $1
-    """
-    prefs_data = await fetch_one(prefs_query, [customer_id])
-    preferences = CustomerPreferences.parse_obj(prefs_data) if prefs_data else None
-    
-    # Combine everything into a CustomerWithDetails object
-    customer = CustomerWithDetails.parse_obj(customer_data)
-    customer.notes = notes
-    customer.preferences = preferences
+    # Notes and preferences are validated as nested models
+    customer = CustomerWithDetails.model_validate(customer_data)
     
     return customer
 
@@ -164,14 +165,13 @@ async def get_producer_by_id(producer_id: UUID) -> Optional[ProducerWithDetails]
     """
     Get a specific producer by ID with details.
     """
-    # Reuse get_customer_by_id function but convert to ProducerWithDetails
+    # Reuse get_customer_by_id function
     customer = await get_customer_by_id(producer_id)
     if not customer:
         return None
     
-    # Convert to ProducerWithDetails model for API consistency
-    producer = ProducerWithDetails.parse_obj(customer.dict())
-    return producer
+    # ProducerWithDetails is an alias of CustomerWithDetails, so no conversion is needed
+    return customer
 
 
 async def create_customer(customer: CustomerCreate) -> Customer:
@@ -238,13 +238,24 @@ async def create_customer(customer: CustomerCreate) -> Customer:
     """
     
     customer_data = await fetch_one(query, params)
-    return Customer.parse_obj(customer_data)
+    return Customer.model_validate(customer_data)
 
 
 async def update_customer(customer_id: UUID, customer_update: CustomerUpdate) -> Optional[Customer]:
     """
     Update an existing customer.
     """
+    # Check the loosely typed fields only when they are being updated
+    if customer_update.email is not None:
+        try:
+            _email.validate_python(customer_update.email)
+        except PydanticValidationError:
+            raise ValidationError(errors=[{"field": "email", "message": "Invalid email address"}])
+    if customer_update.website is not None:
+        url = urlparse(customer_update.website)
+        if url.scheme not in ("http", "https") or not url.netloc:
+            raise ValidationError(errors=[{"field": "website", "message": "Invalid URL"}])
+    
     # Build dynamic update query
     update_fields = {}
     if customer_update.email is not None:
@@ -270,7 +281,7 @@ async def update_customer(customer_id: UUID, customer_update: CustomerUpdate) ->
     if customer_update.producer_type is not None:
         update_fields["producer_type"] = customer_update.producer_type
     if customer_update.website is not None:
-        update_fields["website"] = str(customer_update.website)
+        update_fields["website"] = customer_update.website
     if customer_update.description is not None:
         update_fields["description"] = customer_update.description
     if customer_update.is_active is not None:
@@ -289,7 +300,7 @@ async def update_customer(customer_id: UUID, customer_update: CustomerUpdate) ->
     )
     
     customer_data = await fetch_one(query, params)
-    return Customer.parse_obj(customer_data) if customer_data else None
+    return Customer.model_validate(customer_data) if customer_data else None
 
 
 async def delete_customer(customer_id: UUID) -> bool:
@@ -301,62 +312,104 @@ async def delete_customer(customer_id: UUID) -> bool:
     return result is not None
 
 
-async def get_customer_orders(customer_id: UUID, skip: int = 0, limit: int = 50) -> List[Order]:
+async def get_customer_orders(customer_id: UUID, skip: int = 0, limit: int = 50) -> Optional[List[Order]]:
     """
     Get orders for a specific customer.
+    Returns None if the customer doesn't exist, so callers need no separate
+    existence check.
     """
-    # Query depends on how orders are related to customers in your schema
+    # One round-trip: the customer row gates the result, and the page of
+    # orders is embedded with each order's items
     query = """
     SELECT 
-        o.id, o.customer_id, o.order_number, o.status, o.total_amount, 
-        o.created_at, o.updated_at
+        COALESCE((
+            SELECT json_agg(page ORDER BY page.created_at DESC)
+            FROM (
+                SELECT 
+                    o.id, o.customer_id, o.order_number, o.status, o.total_amount, 
+                    o.created_at, o.updated_at,
+                    COALESCE((
+                        SELECT json_agg(i)
+                        FROM (
+                            SELECT 
+                                id, order_id, product_id, product_name, quantity, unit_price, 
+                                total_price, sku, metadata, created_at
+                            FROM order_items
+                            WHERE order_id = o.id
+                        ) i
+                    ), '[]'::json) AS items
+                FROM 
+                    orders o
+                WHERE 
+                    o.customer_id = c.id
+                ORDER BY 
+                    o.created_at DESC
+                LIMIT $2 OFFSET $3
+            ) page
+        ), '[]'::json) AS orders
     FROM 
-        orders o
+        customers c
     WHERE 
-        o.customer_id = $1
-    ORDER BY 
-        o.created_at DESC
-    LIMIT $2 OFFSET $3
+        c.id = $1
     """
     
-    orders_data = await fetch_all(query, [customer_id, limit, skip])
-    return [Order.parse_obj(order) for order in orders_data]
+    result = await fetch_one(query, [customer_id, limit, skip])
+    if not result:
+        return None
+    
+    return _order_list.validate_python(result["orders"])
 
 
-async def get_customer_notes(customer_id: UUID) -> List[CustomerNote]:
+async def get_customer_notes(customer_id: UUID) -> Optional[List[CustomerNote]]:
     """
     Get all notes for a customer.
+    Returns None if the customer doesn't exist, so callers need no separate
+    existence check.
     """
+    # One round-trip: the customer row gates the result and the notes are
+    # embedded, without loading the rest of the customer's details
     query = """
     SELECT 
-        id, customer_id, content, created_by, created_at 
+        COALESCE((
+            SELECT json_agg(n ORDER BY n.created_at DESC)
+            FROM (
+                SELECT id, customer_id, content, created_by, created_at
+                FROM customer_notes
+                WHERE customer_id = c.id
+            ) n
+        ), '[]'::json) AS notes
     FROM 
-        customer_notes 
+        customers c
     WHERE 
-        customer_id = $1
-    ORDER BY 
-        created_at DESC
+        c.id = $1
     """
     
-    notes_data = await fetch_all(query, [customer_id])
-    return [CustomerNote.parse_obj(note) for note in notes_data]
+    result = await fetch_one(query, [customer_id])
+    if not result:
+        return None
+    
+    return _customer_note_list.validate_python(result["notes"])
 
 
-async def add_customer_note(note: CustomerNoteCreate, created_by: UUID) -> CustomerNote:
+async def add_customer_note(note: CustomerNoteCreate, created_by: UUID) -> Optional[CustomerNote]:
     """
     Add a note to a customer.
+    Returns None if the customer doesn't exist.
     """
+    # Only insert when the customer exists, so no separate check is needed
     query = """
     INSERT INTO customer_notes 
         (customer_id, content, created_by) 
-    VALUES 
-        ($1, $2, $3)
+    SELECT 
+        $1, $2, $3
+    WHERE 
+        EXISTS (SELECT 1 FROM customers WHERE id = $1)
     RETURNING 
         id, customer_id, content, created_by, created_at
     """
     
     note_data = await fetch_one(query, [note.customer_id, note.content, created_by])
-    return CustomerNote.parse_obj(note_data)
+    return _customer_note.validate_python(note_data) if note_data else None
 
 
 async def get_customer_preferences(customer_id: UUID) -> Optional[CustomerPreferences]:
@@ -373,18 +426,22 @@ async def get_customer_preferences(customer_id: UUID) -> Optional[CustomerPrefer
     """
     
     prefs_data = await fetch_one(query, [customer_id])
-    return CustomerPreferences.parse_obj(prefs_data) if prefs_data else None
+    return CustomerPreferences.model_validate(prefs_data) if prefs_data else None
 
 
-async def create_or_update_customer_preferences(preferences: CustomerPreferencesCreate) -> CustomerPreferences:
+async def create_or_update_customer_preferences(preferences: CustomerPreferencesCreate) -> Optional[CustomerPreferences]:
     """
     Create or update customer preferences.
+    Returns None if the customer doesn't exist.
     """
+    # Only upsert when the customer exists, so no separate check is needed
     query = """
     INSERT INTO customer_preferences 
         (customer_id, preferences) 
-    VALUES 
-        ($1, $2)
+    SELECT 
+        $1, $2
+    WHERE 
+        EXISTS (SELECT 1 FROM customers WHERE id = $1)
     ON CONFLICT (customer_id) 
     DO UPDATE SET 
         preferences = $2,
@@ -398,4 +455,4 @@ async def create_or_update_customer_preferences(preferences: CustomerPreferences
         json.dumps(preferences.preferences)
     ])
     
-    return CustomerPreferences.parse_obj(prefs_data) 
\ No newline at end of file
+    return CustomerPreferences.model_validate(prefs_data) if prefs_data else None 
\ No newline at end of file
@@ -2,6 +2,7 @@
 Fulfillment service module for handling order fulfillment operations.
 """
 from typing import Dict, List, Optional, Any
+import asyncio
 from uuid import UUID, uuid4
 from datetime import datetime
 from fastapi import HTTPException, status
@@ -33,7 +34,7 @@ async def generate_producer_pick_list(producer_id: UUID) -> PickList:
     supabase = get_supabase_client()
     
     # 1. Get producer information
-    producer_response = supabase.table("producer_profiles").select("*").eq("id", str(producer_id)).execute()
+    producer_response = await asyncio.to_thread(supabase.table("producer_profiles").select("*").eq("id", str(producer_id)).execute)
     
     if producer_response.error:
         raise HTTPException(
@@ -50,15 +51,19 @@ async def generate_producer_pick_list(producer_id: UUID) -> PickList:
     producer = producer_response.data[0]
     
     # Get the producer's name from users table
-    user_response = supabase.table("users").select("full_name, company_name").eq("id", str(producer_id)).execute()
+    user_response = await asyncio.to_thread(supabase.table("users").select("full_name, company_name").eq("id", str(producer_id)).execute)
     producer_name = "Unknown Producer"
     if user_response.data:
         # Use company name if available, otherwise use full name
         producer_name = user_response.data[0].get("company_name") or user_response.data[0].get("full_name") or producer_name
     
     # 2. Find all pending orders that include products from this producer
-    # First get all products from this producer
-    producer_products_response = supabase.table("products").select("id").eq("producer_id", str(producer_id)).execute()
+    # First get all products from this producer, with the details the pick
+    # list needs, so they don't have to be fetched again one by one
+    producer_products_query = supabase.table("products")\
+        .select("*")\
+        .eq("producer_id", str(producer_id))
+    producer_products_response = await asyncio.to_thread(producer_products_query.execute)
     
     if producer_products_response.error:
         raise HTTPException(
@@ -78,12 +83,13 @@ async def generate_producer_pick_list(producer_id: UUID) -> PickList:
             notes="No products found for this producer"
         )
     
-    # Extract product IDs for querying
-    product_ids = [str(product["id"]) for product in producer_products_response.data]
+    # Index products by ID for querying and for building the pick list items
+    product_details = {str(product["id"]): product for product in producer_products_response.data}
+    product_ids = list(product_details)
     
     # 3. Find pending orders containing these products
     # First we need to find order_items for these products
-    order_items_query = supabase.table("order_items").select("*").in_("product_id", product_ids).execute()
+    order_items_query = await asyncio.to_thread(supabase.table("order_items").select("*").in_("product_id", product_ids).execute)
     
     if order_items_query.error:
         raise HTTPException(
@@ -107,12 +113,12 @@ async def generate_producer_pick_list(producer_id: UUID) -> PickList:
     order_ids = list(set(str(item["order_id"]) for item in order_items_query.data))
     
     # 4. Get pending orders
-    pending_orders_response = supabase.table("orders")\
+    pending_orders_query = supabase.table("orders")\
         .select("*")\
         .in_("id", order_ids)\
         .eq("status", "confirmed")\
-        .in_("fulfillment_status", ["pending", "processing"])\
-        .execute()
+        .in_("fulfillment_status", ["pending", "processing"])
+    pending_orders_response = await asyncio.to_thread(pending_orders_query.execute)
     
     if pending_orders_response.error:
         raise HTTPException(
@@ -133,17 +139,10 @@ async def generate_producer_pick_list(producer_id: UUID) -> PickList:
         )
     
     # Filter order_items to only include those for pending orders
-    pending_order_ids = [order["id"] for order in pending_orders_response.data]
+    pending_order_ids = {order["id"] for order in pending_orders_response.data}
     pending_order_items = [item for item in order_items_query.data if item["order_id"] in pending_order_ids]
     
-    # 5. Fetch complete product details for these items
-    product_details = {}
-    for product_id in product_ids:
-        product_response = supabase.table("products").select("*").eq("id", product_id).execute()
-        if not product_response.error and product_response.data:
-            product_details[product_id] = product_response.data[0]
-    
-    # 6. Group by product and sum quantities
+    # 5. Group by product and sum quantities
     product_quantities = {}
     for item in pending_order_items:
         product_id = item["product_id"]
@@ -152,7 +151,7 @@ async def generate_producer_pick_list(producer_id: UUID) -> PickList:
         else:
             product_quantities[product_id] = item["quantity"]
     
-    # 7. Generate pick list items
+    # 6. Generate pick list items
     pick_list_items = []
     for product_id, quantity in product_quantities.items():
         if product_id in product_details:
@@ -177,11 +176,11 @@ async def generate_producer_pick_list(producer_id: UUID) -> PickList:
                 )
             )
     
-    # 8. Sort items by location if available for optimal picking route
+    # 7. Sort items by location if available for optimal picking route
     # Simple sort for MVP, can be enhanced with more complex algorithms later
     pick_list_items.sort(key=lambda x: (x.location or "ZZZ", x.product_name))
     
-    # 9. Create pick list with a proper UUID
+    # 8. Create pick list with a proper UUID
     pick_list = PickList(
         id=uuid4(),  # Generate a random UUID
         producer_id=producer_id,
@@ -192,7 +191,7 @@ async def generate_producer_pick_list(producer_id: UUID) -> PickList:
         status=FulfillmentStatus.PENDING
     )
     
-    # 10. Send notification about the pick list if there are items to fulfill
+    # 9. Send notification about the pick list if there are items to fulfill
     if len(pick_list_items) > 0:
         try:
             # Use the pick list ID as the reference for the notification
@@ -221,7 +220,7 @@ async def generate_order_packing_slip(order_id: UUID) -> PackingSlip:
     supabase = get_supabase_client()
     
     # 1. Get order details
-    order_response = supabase.table("orders").select("*").eq("id", str(order_id)).execute()
+    order_response = await asyncio.to_thread(supabase.table("orders").select("*").eq("id", str(order_id)).execute)
     
     if order_response.error:
         raise HTTPException(
@@ -246,7 +245,7 @@ async def generate_order_packing_slip(order_id: UUID) -> PackingSlip:
         )
     
     # 2. Get order items
-    order_items_response = supabase.table("order_items").select("*").eq("order_id", str(order_id)).execute()
+    order_items_response = await asyncio.to_thread(supabase.table("order_items").select("*").eq("order_id", str(order_id)).execute)
     
     if order_items_response.error:
         raise HTTPException(
@@ -264,7 +263,7 @@ async def generate_order_packing_slip(order_id: UUID) -> PackingSlip:
     
     # 3. Get customer details
     customer_id = order.get("customer_id")
-    customer_response = supabase.table("users").select("full_name, email").eq("id", customer_id).execute()
+    customer_response = await asyncio.to_thread(supabase.table("users").select("full_name, email").eq("id", customer_id).execute)
     
     customer_name = "Customer"
     customer_email = None
@@ -340,7 +339,7 @@ async def generate_order_packing_slip(order_id: UUID) -> PackingSlip:
         if order_items_response.data:
             product_id = order_items_response.data[0].get("product_id")
             if product_id:
-                product_response = supabase.table("products").select("producer_id").eq("id", product_id).execute()
+                product_response = await asyncio.to_thread(supabase.table("products").select("producer_id").eq("id", product_id).execute)
                 if not product_response.error and product_response.data:
                     producer_id = product_response.data[0].get("producer_id")
         
@@ -402,7 +401,7 @@ async def get_orders_by_producer(
     if producer_id:
         products_query = products_query.eq("producer_id", str(producer_id))
     
-    products_response = products_query.execute()
+    products_response = await asyncio.to_thread(products_query.execute)
     
     if products_response.error:
         raise HTTPException(
@@ -425,65 +424,15 @@ async def get_orders_by_producer(
                 "message": "No products found"
             }
     
-    # Group products by producer_id
-    products_by_producer = {}
-    product_ids = []
-    
-    for product in products_response.data:
-        prod_id = product["id"]
-        producer_id = product["producer_id"]
-        
-        product_ids.append(prod_id)
-        
-        if producer_id not in products_by_producer:
-            products_by_producer[producer_id] = []
-            
-        products_by_producer[producer_id].append(product)
-    
-    # Step 2: Find order items containing these products
-    if not product_ids:
-        if producer_id:
-            return {
-                "producer_id": producer_id,
-                "orders": [],
-                "total_orders": 0,
-                "message": "No products found for this producer"
-            }
-        else:
-            return {
-                "producers": [],
-                "total_producers": 0,
-                "message": "No products found"
-            }
-    
-    order_items_query = supabase.table("order_items").select("*").in_("product_id", product_ids).execute()
+    # Map each product to its producer for constant-time lookups below
+    product_producers = {product["id"]: product["producer_id"] for product in products_response.data}
+    product_ids = list(product_producers)
     
-    if order_items_query.error:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error fetching order items: {order_items_query.error.message}"
-        )
-    
-    if not order_items_query.data:
-        if producer_id:
-            return {
-                "producer_id": producer_id,
-                "orders": [],
-                "total_orders": 0,
-                "message": "No orders found for this producer's products"
-            }
-        else:
-            return {
-                "producers": [],
-                "total_producers": 0,
-                "message": "No orders found for any producers"
-            }
-    
-    # Get order IDs from order items
-    order_ids = list(set(str(item["order_id"]) for item in order_items_query.data))
-    
-    # Step 3: Get the orders with those IDs
-    orders_query = supabase.table("orders").select("*").in_("id", order_ids)
+    # Steps 2-3: Get the page of orders containing these products, with the
+    # matching order items embedded, in a single request
+    orders_query = supabase.table("orders")\
+        .select("*, order_items!inner(*)")\
+        .in_("order_items.product_id", product_ids)
     
     # Apply status filter if provided
     if status:
@@ -496,7 +445,7 @@ async def get_orders_by_producer(
     # Apply pagination
     orders_query = orders_query.order("created_at", desc=True).range(skip, skip + limit - 1)
     
-    orders_response = orders_query.execute()
+    orders_response = await asyncio.to_thread(orders_query.execute)
     
     if orders_response.error:
         raise HTTPException(
@@ -520,51 +469,19 @@ async def get_orders_by_producer(
             }
     
     # Step 4: Group orders by producer
-    # We need to determine which producers have items in which orders
+    # Each order is added once per producer with only that producer's items
     orders_by_producer = {}
-    
-    # First, create a mapping from order_id to order object
-    order_map = {order["id"]: order for order in orders_response.data}
-    
-    # Group order items by order_id
-    order_items_by_order = {}
-    for item in order_items_query.data:
-        order_id = item["order_id"]
-        if order_id not in order_items_by_order:
-            order_items_by_order[order_id] = []
-        order_items_by_order[order_id].append(item)
-    
-    # For each product in an order, add that order to the appropriate producer
-    for order_id, items in order_items_by_order.items():
-        # Skip if order not in filtered results
-        if order_id not in order_map:
-            continue
-            
-        order = order_map[order_id]
+    for order in orders_response.data:
+        items = order.pop("order_items", None) or []
         
-        # Find which producers have items in this order
-        producers_in_order = set()
+        items_by_producer = {}
         for item in items:
-            product_id = item["product_id"]
-            # Find the producer of this product
-            for p_id, products in products_by_producer.items():
-                if any(p["id"] == product_id for p in products):
-                    producers_in_order.add(p_id)
+            items_by_producer.setdefault(product_producers[item["product_id"]], []).append(item)
         
-        # Add this order to each producer's list
-        for p_id in producers_in_order:
-            if p_id not in orders_by_producer:
-                orders_by_producer[p_id] = []
-            
-            # Check if we've already added this order to this producer
-            if not any(o["id"] == order_id for o in orders_by_producer[p_id]):
-                # Add order with its items
-                order_with_items = order.copy()
-                order_with_items["items"] = [
-                    item for item in items 
-                    if any(p["id"] == item["product_id"] for p in products_by_producer[p_id])
-                ]
-                orders_by_producer[p_id].append(order_with_items)
+        for p_id, producer_items in items_by_producer.items():
+            order_with_items = order.copy()
+            order_with_items["items"] = producer_items
+            orders_by_producer.setdefault(p_id, []).append(order_with_items)
     
     # Step 5: Get producer names and details
     producer_ids = list(orders_by_producer.keys())
@@ -584,7 +501,7 @@ async def get_orders_by_producer(
                 "message": "No orders found for any producers with the specified criteria"
             }
     
-    producers_response = supabase.table("users").select("id,full_name,company_name").in_("id", producer_ids).execute()
+    producers_response = await asyncio.to_thread(supabase.table("users").select("id,full_name,company_name").in_("id", producer_ids).execute)
     
     producer_details = {}
     if not producers_response.error and producers_response.data:
@@ -615,22 +532,26 @@ async def get_orders_by_producer(
                           if order.get("status") == "confirmed" and 
                           order.get("fulfillment_status") in ["pending", None]]
             
-            # Send new order notifications
-            for order in new_orders:
-                # Check if notification already sent by looking for a notification history entry
-                notification_check = supabase.table("notification_history")\
-                    .select("id")\
-                    .eq("entity_id", str(order.get("id")))\
+            if new_orders:
+                # Check which orders were already notified about with one
+                # notification history lookup for all of them
+                notification_query = supabase.table("notification_history")\
+                    .select("entity_id")\
+                    .in_("entity_id", [str(order.get("id")) for order in new_orders])\
                     .eq("notification_type", "new_order")\
-                    .eq("recipient_id", str(producer_id))\
-                    .execute()
+                    .eq("recipient_id", str(producer_id))
+                notification_check = await asyncio.to_thread(notification_query.execute)
                 
-                # Only notify if no previous notification found
-                if not notification_check.error and not notification_check.data:
-                    await NotificationService.notify_new_order(
-                        UUID(order.get("id")),
-                        producer_id
-                    )
+                if not notification_check.error:
+                    notified_ids = {str(entry["entity_id"]) for entry in notification_check.data or []}
+                    
+                    # Send new order notifications, only if no previous notification found
+                    for order in new_orders:
+                        if str(order.get("id")) not in notified_ids:
+                            await NotificationService.notify_new_order(
+                                UUID(order.get("id")),
+                                producer_id
+                            )
         except Exception as e:
             # Log error but don't fail the order retrieval if notification fails
             print(f"Error sending new order notifications: {str(e)}")
@@ -659,6 +580,38 @@ async def get_orders_by_producer(
         }
 
 
+def _get_order_producer_id(supabase, order_id: UUID) -> Optional[str]:
+    """
+    Get the producer of an order's first item, used to route notifications.
+    
+    Args:
+        supabase: Supabase client
+        order_id: UUID of the order
+        
+    Returns:
+        Optional[str]: Producer ID, or None if it can't be determined
+    """
+    try:
+        # Get producer ID from the order items
+        order_items_response = supabase.table("order_items").select("product_id").eq("order_id", str(order_id)).limit(1).execute()
+        if order_items_response.error or not order_items_response.data:
+            return None
+        
+        # Get first product's producer_id
+        product_id = order_items_response.data[0].get("product_id")
+        if not product_id:
+            return None
+        
+        product_response = supabase.table("products").select("producer_id").eq("id", product_id).execute()
+        if product_response.data:
+            return product_response.data[0].get("producer_id")
+        return None
+    except Exception as e:
+        # Log error but don't fail the status update if the lookup fails
+        print(f"Error looking up order producer: {str(e)}")
+        return None
+
+
 async def update_fulfillment_status(
     order_id: UUID,
     new_status: str,
@@ -680,7 +633,7 @@ async def update_fulfillment_status(
     supabase = get_supabase_client()
     
     # 1. Get current order status
-    order_response = supabase.table("orders").select("*").eq("id", str(order_id)).execute()
+    order_response = await asyncio.to_thread(supabase.table("orders").select("*").eq("id", str(order_id)).execute)
     
     if order_response.error:
         raise HTTPException(
@@ -719,7 +672,7 @@ async def update_fulfillment_status(
     elif new_status == FulfillmentStatus.CANCELLED:
         update_data["status"] = "cancelled"
     
-    update_response = supabase.table("orders").update(update_data).eq("id", str(order_id)).execute()
+    update_response = await asyncio.to_thread(supabase.table("orders").update(update_data).eq("id", str(order_id)).execute)
     
     if update_response.error:
         raise HTTPException(
@@ -737,7 +690,12 @@ async def update_fulfillment_status(
         "created_at": datetime.now().isoformat()
     }
     
-    history_response = supabase.table("fulfillment_history").insert(history_entry).execute()
+    # The history entry and the producer lookup for the notification are
+    # independent, so run both requests concurrently
+    history_response, producer_id = await asyncio.gather(
+        asyncio.to_thread(supabase.table("fulfillment_history").insert(history_entry).execute),
+        asyncio.to_thread(_get_order_producer_id, supabase, order_id)
+    )
     
     if history_response.error:
         # Log error but continue (don't fail the status update just because history logging failed)
@@ -747,19 +705,6 @@ async def update_fulfillment_status(
 
     # 5. Send notification to the producer
     try:
-        # Get producer ID from the order items
-        product_response = None
-        order_items_response = supabase.table("order_items").select("*").eq("order_id", str(order_id)).execute()
-        if not order_items_response.error and order_items_response.data:
-            # Get first product's producer_id
-            product_id = order_items_response.data[0].get("product_id")
-            if product_id:
-                product_response = supabase.table("products").select("producer_id").eq("id", product_id).execute()
-        
-        producer_id = None
-        if product_response and product_response.data:
-            producer_id = product_response.data[0].get("producer_id")
-        
         if producer_id:
             status_message = notes or f"Order status updated to {new_status}"
             
@@ -789,11 +734,11 @@ async def get_fulfillment_history(order_id: UUID) -> List[Dict]:
     """
     supabase = get_supabase_client()
     
-    history_response = supabase.table("fulfillment_history")\
+    history_query = supabase.table("fulfillment_history")\
         .select("*")\
         .eq("order_id", str(order_id))\
-        .order("created_at", desc=False)\
-        .execute()
+        .order("created_at", desc=False)
+    history_response = await asyncio.to_thread(history_query.execute)
     
     if history_response.error:
         raise HTTPException(
@@ -2,6 +2,7 @@
 Order service for handling database operations related to orders.
 """
 from fastapi import HTTPException, status
+import asyncio
 from typing import Dict, List, Optional, Any
 from uuid import UUID
 from datetime import datetime
@@ -23,7 +24,8 @@ async def get_orders(
     Get a list of orders with optional filtering.
     """
     supabase = get_supabase_client()
-    query = supabase.table("orders").select("*")
+    # Embed each order's items so the page and its items come back in one query
+    query = supabase.table("orders").select("*, items:order_items(*)")
     
     if customer_id:
         query = query.eq("customer_id", str(customer_id))
@@ -31,7 +33,7 @@ async def get_orders(
     if status:
         query = query.eq("status", status)
     
-    response = query.order("created_at", desc=True).range(skip, skip + limit - 1).execute()
+    response = await asyncio.to_thread(query.order("created_at", desc=True).range(skip, skip + limit - 1).execute)
     
     if response.error:
         raise HTTPException(
@@ -49,7 +51,7 @@ async def get_order_by_id(order_id: UUID) -> Dict:
     supabase = get_supabase_client()
     
     # Get the order
-    order_response = supabase.table("orders").select("*").eq("id", str(order_id)).single().execute()
+    order_response = await asyncio.to_thread(supabase.table("orders").select("*").eq("id", str(order_id)).single().execute)
     
     if order_response.error:
         raise HTTPException(
@@ -59,24 +61,52 @@ async def get_order_by_id(order_id: UUID) -> Dict:
     
     order = order_response.data
     
-    # Get order items
-    items_response = supabase.table("order_items").select("*").eq("order_id", str(order_id)).execute()
+    # The related records only depend on the order ID, so fetch them concurrently
+    order_id_str = str(order_id)
+    items_response, history_response, notes_response = await asyncio.gather(
+        asyncio.to_thread(supabase.table("order_items").select("*").eq("order_id", order_id_str).execute),
+        asyncio.to_thread(supabase.table("order_history").select("*").eq("order_id", order_id_str).order("created_at", desc=True).execute),
+        asyncio.to_thread(supabase.table("order_notes").select("*").eq("order_id", order_id_str).order("created_at", desc=True).execute)
+    )
+    
     if not items_response.error:
         order["items"] = items_response.data
     
-    # Get order history
-    history_response = supabase.table("order_history").select("*").eq("order_id", str(order_id)).order("created_at", desc=True).execute()
     if not history_response.error:
         order["history"] = history_response.data
     
-    # Get order notes
-    notes_response = supabase.table("order_notes").select("*").eq("order_id", str(order_id)).order("created_at", desc=True).execute()
     if not notes_response.error:
         order["order_notes"] = notes_response.data
     
     return order
 
 
+# Columns needed to describe an order's fulfillment state
+ORDER_FULFILLMENT_COLUMNS = (
+    "id, customer_id, status, fulfillment_status, shipping_method_id, shipping_cost, "
+    "shipping_carrier, tracking_number, estimated_delivery_date, shipping_address"
+)
+
+
+async def get_order_fulfillment_fields(order_id: UUID) -> Dict:
+    """
+    Get only the fulfillment-related columns of an order.
+    Unlike get_order_by_id, this is a single narrow query without items,
+    history or notes.
+    """
+    supabase = get_supabase_client()
+    
+    order_response = await asyncio.to_thread(supabase.table("orders").select(ORDER_FULFILLMENT_COLUMNS).eq("id", str(order_id)).single().execute)
+    
+    if order_response.error:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND if order_response.error.message == "No rows found" else status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching order: {order_response.error.message}"
+        )
+    
+    return order_response.data
+
+
 async def create_order(order: OrderCreate, user_id: UUID) -> Dict:
     """
     Create a new order with items.
@@ -84,13 +114,13 @@ async def create_order(order: OrderCreate, user_id: UUID) -> Dict:
     supabase = get_supabase_client()
     
     # Create order
-    order_data = order.dict(exclude={"items"})
+    order_data = order.model_dump(exclude={"items"})
     
     # Ensure customer_id is set to the user_id if not explicitly provided
     if "customer_id" not in order_data:
         order_data["customer_id"] = str(user_id)
     
-    order_response = supabase.table("orders").insert(order_data).execute()
+    order_response = await asyncio.to_thread(supabase.table("orders").insert(order_data).execute)
     
     if order_response.error:
         raise HTTPException(
@@ -104,16 +134,16 @@ async def create_order(order: OrderCreate, user_id: UUID) -> Dict:
     # Create order items
     items_data = []
     for item in order.items:
-        item_dict = item.dict()
+        item_dict = item.model_dump()
         item_dict["order_id"] = order_id
         items_data.append(item_dict)
     
     if items_data:
-        items_response = supabase.table("order_items").insert(items_data).execute()
+        items_response = await asyncio.to_thread(supabase.table("order_items").insert(items_data).execute)
         
         if items_response.error:
             # Rollback order creation if items insertion fails
-            supabase.table("orders").delete().eq("id", order_id).execute()
+            await asyncio.to_thread(supabase.table("orders").delete().eq("id", order_id).execute)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error creating order items: {items_response.error.message}"
@@ -129,24 +159,37 @@ async def create_order(order: OrderCreate, user_id: UUID) -> Dict:
         "notes": "Order created"
     }
     
-    supabase.table("order_history").insert(history_data).execute()
+    await asyncio.to_thread(supabase.table("order_history").insert(history_data).execute)
     
     return created_order
 
 
-async def update_order(order_id: UUID, order_update: OrderUpdate, user_id: UUID) -> Dict:
+async def update_order(
+    order_id: UUID,
+    order_update: OrderUpdate,
+    user_id: UUID,
+    current_order: Optional[Dict] = None
+) -> Dict:
     """
     Update an existing order.
+    
+    Args:
+        order_id: ID of the order to update
+        order_update: Fields to update
+        user_id: ID of the user making the change
+        current_order: The order as already loaded by the caller, if any
     """
     supabase = get_supabase_client()
     
-    # Get the current order
-    current_order = await get_order_by_id(order_id)
+    # Get the current order unless the caller already loaded it
+    if current_order is None:
+        current_order = await get_order_by_id(order_id)
     
     # Update the order
-    update_data = order_update.dict(exclude_none=True)
+    update_data = order_update.model_dump(exclude_none=True)
     
     # If status has changed, create a history record
+    history_record = None
     if "status" in update_data and update_data["status"] != current_order["status"]:
         history_data = {
             "order_id": str(order_id),
@@ -156,16 +199,18 @@ async def update_order(order_id: UUID, order_update: OrderUpdate, user_id: UUID)
             "notes": f"Status updated from {current_order['status']} to {update_data['status']}"
         }
         
-        history_response = supabase.table("order_history").insert(history_data).execute()
+        history_response = await asyncio.to_thread(supabase.table("order_history").insert(history_data).execute)
         
         if history_response.error:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error creating order history: {history_response.error.message}"
             )
+        
+        history_record = history_response.data[0]
     
     # Update the order
-    order_response = supabase.table("orders").update(update_data).eq("id", str(order_id)).execute()
+    order_response = await asyncio.to_thread(supabase.table("orders").update(update_data).eq("id", str(order_id)).execute)
     
     if order_response.error:
         raise HTTPException(
@@ -179,7 +224,19 @@ async def update_order(order_id: UUID, order_update: OrderUpdate, user_id: UUID)
             detail="Order not found"
         )
     
-    return await get_order_by_id(order_id)
+    # Updating the order row doesn't touch its items or notes, so reuse the
+    # related records already loaded instead of fetching the whole order again
+    updated_order = order_response.data[0]
+    for key in ("items", "order_notes"):
+        if key in current_order:
+            updated_order[key] = current_order[key]
+    
+    # History is newest first, matching get_order_by_id
+    if "history" in current_order:
+        history = current_order["history"]
+        updated_order["history"] = [history_record, *history] if history_record else history
+    
+    return updated_order
 
 
 async def delete_order(order_id: UUID) -> bool:
@@ -189,7 +246,7 @@ async def delete_order(order_id: UUID) -> bool:
     supabase = get_supabase_client()
     
     # Delete the order will cascade to items, history, and notes
-    response = supabase.table("orders").delete().eq("id", str(order_id)).execute()
+    response = await asyncio.to_thread(supabase.table("orders").delete().eq("id", str(order_id)).execute)
     
     if response.error:
         raise HTTPException(
@@ -212,11 +269,11 @@ async def add_order_note(order_id: UUID, note: OrderNoteCreate, user_id: UUID) -
     """
     supabase = get_supabase_client()
     
-    note_data = note.dict()
+    note_data = note.model_dump()
     note_data["order_id"] = str(order_id)
     note_data["user_id"] = str(user_id)
     
-    response = supabase.table("order_notes").insert(note_data).execute()
+    response = await asyncio.to_thread(supabase.table("order_notes").insert(note_data).execute)
     
     if response.error:
         raise HTTPException(
@@ -42,6 +42,13 @@ VALID_STATUS_TRANSITIONS = {
     OrderStatus.RETURNED: set()  # Terminal state
 }
 
+# Valid next status values keyed by status value, precomputed so lookups by
+# the raw status string skip enum conversion and set iteration
+_VALID_TRANSITION_VALUES = {
+    current.value: tuple(sorted(target.value for target in targets))
+    for current, targets in VALID_STATUS_TRANSITIONS.items()
+}
+
 # Define roles that can perform each transition
 STATUS_TRANSITION_ROLES = {
     (OrderStatus.NEW, OrderStatus.PENDING): {"customer", "staff", "admin"},
@@ -71,12 +78,8 @@ async def get_valid_status_transitions(current_status: str) -> List[str]:
     """
     Get the list of valid status transitions from the current status.
     """
-    try:
-        current = OrderStatus(current_status)
-        return [status.value for status in VALID_STATUS_TRANSITIONS.get(current, set())]
-    except ValueError:
-        # If current status is not valid, return empty list
-        return []
+    # If current status is not valid, return empty list
+    return list(_VALID_TRANSITION_VALUES.get(current_status, ()))
 
 
 async def can_transition_status(
@@ -113,13 +116,23 @@ async def transition_order_status(
     new_status: str,
     user_id: UUID,
     user_role: str,
-    notes: Optional[str] = None
+    notes: Optional[str] = None,
+    order: Optional[Dict] = None
 ) -> Dict:
     """
     Transition an order to a new status with validation and business logic.
+    
+    Args:
+        order_id: ID of the order to transition
+        new_status: Status to move the order to
+        user_id: ID of the user making the change
+        user_role: Role of the user making the change
+        notes: Optional notes for the history record
+        order: The order as already loaded by the caller, if any
     """
-    # Get the current order
-    order = await get_order_by_id(order_id)
+    # Get the current order unless the caller already loaded it
+    if order is None:
+        order = await get_order_by_id(order_id)
     current_status = order.get("status")
     
     # Validate the transition
@@ -153,22 +166,31 @@ async def transition_order_status(
         update_data.payment_status = payment_status
     
     # Perform the update
-    return await update_order(order_id, update_data, user_id)
+    return await update_order(order_id, update_data, user_id, current_order=order)
 
 
-async def get_order_status_history(order_id: UUID) -> List[Dict]:
+async def get_order_status_history(order_id: UUID, order: Optional[Dict] = None) -> List[Dict]:
     """
     Get the history of status changes for an order.
+    
+    Args:
+        order_id: ID of the order
+        order: The order as already loaded by the caller, if any
     """
-    order = await get_order_by_id(order_id)
+    if order is None:
+        order = await get_order_by_id(order_id)
     return order.get("history", [])
 
 
-async def get_status_timeline(order_id: UUID) -> List[Dict]:
+async def get_status_timeline(order_id: UUID, order: Optional[Dict] = None) -> List[Dict]:
     """
     Get a human-readable timeline of order status changes.
+    
+    Args:
+        order_id: ID of the order
+        order: The order as already loaded by the caller, if any
     """
-    history = await get_order_status_history(order_id)
+    history = await get_order_status_history(order_id, order)
     
     timeline = []
     for entry in history:
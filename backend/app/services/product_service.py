@@ -5,6 +5,7 @@ from typing import Dict, Any, List, Optional, Union
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime
+import asyncio
 import logging
 from app.utils.db import get_supabase_client
 from app.utils.logging import setup_logger
@@ -37,7 +38,7 @@ async def get_products(skip: int = 0, limit: int = 100, filters: Optional[Dict[s
     query = query.range(skip, skip + limit - 1)
     
     try:
-        response = query.execute()
+        response = await asyncio.to_thread(query.execute)
         return response.data
     except Exception as e:
         logger.error(f"Error fetching products: {str(e)}")
@@ -55,7 +56,7 @@ async def get_product_by_id(product_id: Union[str, UUID]) -> Optional[Dict[str,
     """
     supabase = get_supabase_client()
     try:
-        response = supabase.table("products").select("*").eq("id", str(product_id)).execute()
+        response = await asyncio.to_thread(supabase.table("products").select("*").eq("id", str(product_id)).execute)
         return response.data[0] if response.data else None
     except Exception as e:
         logger.error(f"Error fetching product {product_id}: {str(e)}")
@@ -80,7 +81,7 @@ async def create_product(product_data: Dict[str, Any]) -> Dict[str, Any]:
             "updated_at": now
         })
         
-        response = supabase.table("products").insert(product_data).execute()
+        response = await asyncio.to_thread(supabase.table("products").insert(product_data).execute)
         return response.data[0] if response.data else {}
     except Exception as e:
         logger.error(f"Error creating product: {str(e)}")
@@ -104,7 +105,7 @@ async def update_product(product_id: Union[str, UUID], product_data: Dict[str, A
             "updated_at": datetime.utcnow().isoformat()
         })
         
-        response = supabase.table("products").update(product_data).eq("id", str(product_id)).execute()
+        response = await asyncio.to_thread(supabase.table("products").update(product_data).eq("id", str(product_id)).execute)
         return response.data[0] if response.data else None
     except Exception as e:
         logger.error(f"Error updating product {product_id}: {str(e)}")
@@ -122,7 +123,7 @@ async def delete_product(product_id: Union[str, UUID]) -> bool:
     """
     supabase = get_supabase_client()
     try:
-        response = supabase.table("products").delete().eq("id", str(product_id)).execute()
+        response = await asyncio.to_thread(supabase.table("products").delete().eq("id", str(product_id)).execute)
         return len(response.data) > 0
     except Exception as e:
         logger.error(f"Error deleting product {product_id}: {str(e)}")
@@ -137,7 +138,7 @@ async def get_inventory() -> List[Dict[str, Any]]:
     """
     supabase = get_supabase_client()
     try:
-        response = supabase.table("products").select("id, name, stock_quantity, unit").execute()
+        response = await asyncio.to_thread(supabase.table("products").select("id, name, stock_quantity, unit").execute)
         return response.data
     except Exception as e:
         logger.error(f"Error fetching inventory: {str(e)}")
@@ -183,12 +184,12 @@ async def adjust_inventory(product_id: Union[str, UUID], quantity: int) -> Dict[
                 "transaction_type": "adjustment",
                 "created_at": datetime.utcnow().isoformat()
             }
-            supabase.table("inventory_transactions").insert(transaction_data).execute()
+            await asyncio.to_thread(supabase.table("inventory_transactions").insert(transaction_data).execute)
         except Exception as e:
             # Just log this but don't fail the transaction if this table doesn't exist
             logger.warning(f"Could not record inventory transaction: {str(e)}")
         
-        response = supabase.table("products").update(update_data).eq("id", str(product_id)).execute()
+        response = await asyncio.to_thread(supabase.table("products").update(update_data).eq("id", str(product_id)).execute)
         return response.data[0] if response.data else {}
     except Exception as e:
         logger.error(f"Error adjusting inventory for product {product_id}: {str(e)}")
@@ -206,12 +207,12 @@ async def get_categories() -> List[str]:
     try:
         # Try to get categories from the categories table if it exists
         try:
-            response = supabase.table("product_categories").select("name").execute()
+            response = await asyncio.to_thread(supabase.table("product_categories").select("name").execute)
             return [category["name"] for category in response.data]
         except Exception:
             # If categories table doesn't exist, get distinct categories from products
             logger.info("No product_categories table found, getting distinct categories from products")
-            response = supabase.table("products").select("category").execute()
+            response = await asyncio.to_thread(supabase.table("products").select("category").execute)
             categories = set()
             for product in response.data:
                 if product.get("category") and product["category"].strip():
@@ -239,7 +240,7 @@ async def create_category(name: str) -> str:
                 "name": name,
                 "created_at": datetime.utcnow().isoformat()
             }
-            response = supabase.table("product_categories").insert(category_data).execute()
+            response = await asyncio.to_thread(supabase.table("product_categories").insert(category_data).execute)
             return response.data[0]["name"] if response.data else name
         except Exception:
             # If categories table doesn't exist, just return the name
@@ -275,14 +276,14 @@ async def update_category(old_name: str, new_name: str) -> str:
                 "name": new_name,
                 "updated_at": datetime.utcnow().isoformat()
             }
-            response = supabase.table("product_categories").update(update_data).eq("name", old_name).execute()
+            response = await asyncio.to_thread(supabase.table("product_categories").update(update_data).eq("name", old_name).execute)
             
             # Also update all products with this category
             product_update = {
                 "category": new_name,
                 "updated_at": datetime.utcnow().isoformat()
             }
-            supabase.table("products").update(product_update).eq("category", old_name).execute()
+            await asyncio.to_thread(supabase.table("products").update(product_update).eq("category", old_name).execute)
             
             return new_name
         except ValueError:
@@ -301,7 +302,7 @@ async def update_category(old_name: str, new_name: str) -> str:
                 "category": new_name,
                 "updated_at": datetime.utcnow().isoformat()
             }
-            supabase.table("products").update(product_update).eq("category", old_name).execute()
+            await asyncio.to_thread(supabase.table("products").update(product_update).eq("category", old_name).execute)
             
             return new_name
     except Exception as e:
@@ -328,14 +329,14 @@ async def delete_category(name: str) -> None:
         # Try to delete from the categories table if it exists
         try:
             # Delete from categories table
-            supabase.table("product_categories").delete().eq("name", name).execute()
+            await asyncio.to_thread(supabase.table("product_categories").delete().eq("name", name).execute)
             
             # Update all products with this category to have null category
             product_update = {
                 "category": None,
                 "updated_at": datetime.utcnow().isoformat()
             }
-            supabase.table("products").update(product_update).eq("category", name).execute()
+            await asyncio.to_thread(supabase.table("products").update(product_update).eq("category", name).execute)
         except Exception:
             # If categories table doesn't exist, just update products
             logger.info("No product_categories table found, removing category from products only")
@@ -344,7 +345,7 @@ async def delete_category(name: str) -> None:
                 "category": None,
                 "updated_at": datetime.utcnow().isoformat()
             }
-            supabase.table("products").update(product_update).eq("category", name).execute()
+            await asyncio.to_thread(supabase.table("products").update(product_update).eq("category", name).execute)
     except ValueError:
         # Re-raise ValueError for not found
         raise
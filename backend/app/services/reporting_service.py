@@ -6,18 +6,42 @@ from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
 from decimal import Decimal
+import asyncio
+import hashlib
 import json
 import csv
 import io
 from dateutil.relativedelta import relativedelta
+from pydantic_core import to_json
 
 from app.services.supabase import get_supabase_client
+from app.utils.cache import TTLCache
+from app.utils.logging import setup_logger
 from app.schemas.fulfillment import (
     FulfillmentMetric, FulfillmentMetricsReport, FulfillmentPerformanceReport,
     FulfillmentExceptionReport, FulfillmentReportFilters, FulfillmentTimeMetrics,
     FulfillmentAccuracyMetrics, FulfillmentCostMetrics, FulfillmentVolumeMetrics
 )
 
+logger = setup_logger(__name__)
+
+# Report jobs live in this process only: a job can only be polled on the
+# worker that started it, so the API must run with a single worker
+# (WEB_CONCURRENCY=1) until job state moves to a shared store.
+
+# Generated reports, serialized to JSON and keyed by job ID
+REPORT_CACHE_TTL_SECONDS = 600
+_report_cache = TTLCache(maxsize=256, ttl=REPORT_CACHE_TTL_SECONDS)
+
+# Jobs whose report could not be generated, keyed by job ID. Kept briefly so
+# polling clients learn about the failure; requesting the report again retries.
+REPORT_FAILURE_TTL_SECONDS = 60
+_report_failures = TTLCache(maxsize=256, ttl=REPORT_FAILURE_TTL_SECONDS)
+
+# Reports currently being generated, keyed by job ID. Holding the task here
+# also keeps it from being garbage collected before it finishes.
+_report_jobs: Dict[str, asyncio.Task] = {}
+
 
 async def generate_metrics_report(filters: FulfillmentReportFilters) -> FulfillmentMetricsReport:
     """
@@ -191,6 +215,97 @@ async def generate_exception_report(filters: FulfillmentReportFilters) -> Fulfil
     )
 
 
+_REPORT_GENERATORS = {
+    "metrics": generate_metrics_report,
+    "performance": generate_performance_report,
+    "exceptions": generate_exception_report,
+}
+
+
+def get_report_job_id(report_type: str, filters: FulfillmentReportFilters) -> str:
+    """
+    Get the job ID for a report, derived from its type and filters.
+
+    Args:
+        report_type: Type of report ('metrics', 'performance', 'exceptions')
+        filters: Report filters
+
+    Returns:
+        str: Job ID shared by every request for the same report
+    """
+    key = f"{report_type}:{filters.model_dump_json()}".encode()
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+
+async def _run_report_job(job_id: str, report_type: str, filters: FulfillmentReportFilters) -> None:
+    """
+    Generate a report and cache its serialized payload.
+
+    Args:
+        job_id: Job ID to cache the report under
+        report_type: Type of report to generate
+        filters: Report filters
+    """
+    try:
+        report = await _REPORT_GENERATORS[report_type](filters)
+        _report_cache.set(job_id, to_json(report))
+    except Exception as e:
+        logger.error(f"Error generating {report_type} report {job_id}: {str(e)}")
+        _report_failures.set(job_id, True)
+    finally:
+        _report_jobs.pop(job_id, None)
+
+
+def start_report_job(report_type: str, filters: FulfillmentReportFilters) -> Tuple[str, Optional[bytes]]:
+    """
+    Get a cached report, or start generating it in the background.
+
+    Identical requests share one job, so a report is only computed once per
+    cache period no matter how often it is requested.
+
+    Args:
+        report_type: Type of report ('metrics', 'performance', 'exceptions')
+        filters: Report filters
+
+    Returns:
+        Tuple[str, Optional[bytes]]: The job ID and the cached JSON payload,
+        or None if the report is still being generated
+    """
+    job_id = get_report_job_id(report_type, filters)
+
+    payload = _report_cache.get(job_id)
+    if payload is not None:
+        return job_id, payload
+
+    if job_id not in _report_jobs:
+        _report_failures.pop(job_id)
+        _report_jobs[job_id] = asyncio.create_task(_run_report_job(job_id, report_type, filters))
+
+    return job_id, None
+
+
+def get_report_job_result(job_id: str) -> Tuple[Optional[str], Optional[bytes]]:
+    """
+    Get the state of a report job.
+
+    Args:
+        job_id: Job ID returned when the report was requested
+
+    Returns:
+        Tuple[Optional[str], Optional[bytes]]: The job status ('ready',
+        'pending' or 'failed', or None if the job is unknown or expired), and
+        the cached JSON payload once the report is ready
+    """
+    payload = _report_cache.get(job_id)
+    if payload is not None:
+        return "ready", payload
+    if job_id in _report_jobs:
+        return "pending", None
+    if _report_failures.get(job_id):
+        return "failed", None
+    return None, None
+
+
 async def export_report(report_id: UUID, format: str, include_charts: bool) -> Tuple[bytes, str]:
     """
     Export a report in the specified format.
@@ -203,11 +318,35 @@ async def export_report(report_id: UUID, format: str, include_charts: bool) -> T
     Returns:
         Tuple[bytes, str]: The exported report data and the content type
     """
+    # Reject formats that can't be exported before touching the database
+    export_format = format.lower()
+    if export_format == 'pdf':
+        # For MVP, return a not implemented error
+        # In a later phase, PDF generation would be implemented here
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"PDF export is not implemented in the current version"
+        )
+    elif export_format == 'excel':
+        # For MVP, return a not implemented error
+        # In a later phase, Excel export would be implemented here
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"Excel export is not implemented in the current version"
+        )
+    elif export_format not in ('json', 'csv'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format: {format}"
+        )
+    
     # Get Supabase client
     supabase = get_supabase_client()
     
-    # Fetch the report from the database
-    report_response = supabase.table("fulfillment_reports").select("*").eq("id", str(report_id)).execute()
+    # Fetch the report from the database, off the event loop
+    report_response = await asyncio.to_thread(
+        supabase.table("fulfillment_reports").select("*").eq("id", str(report_id)).execute
+    )
     
     if report_response.error:
         raise HTTPException(
@@ -223,32 +362,12 @@ async def export_report(report_id: UUID, format: str, include_charts: bool) -> T
     
     report_data = report_response.data[0]
     
-    # Handle different export formats
-    if format.lower() == 'json':
+    if export_format == 'json':
         content = json.dumps(report_data, default=str).encode('utf-8')
         content_type = 'application/json'
-    elif format.lower() == 'csv':
+    else:
         content = _convert_report_to_csv(report_data)
         content_type = 'text/csv'
-    elif format.lower() == 'pdf':
-        # For MVP, return a not implemented error
-        # In a later phase, PDF generation would be implemented here
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail=f"PDF export is not implemented in the current version"
-        )
-    elif format.lower() == 'excel':
-        # For MVP, return a not implemented error
-        # In a later phase, Excel export would be implemented here
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail=f"Excel export is not implemented in the current version"
-        )
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Unsupported export format: {format}"
-        )
     
     return content, content_type
 
@@ -306,7 +425,8 @@ async def schedule_report(
         "report_type": report_type,
         "frequency": frequency,
         "recipients": recipients,
-        "filters": filters.dict(),
+        # JSON mode, so dates and IDs are already strings when the row is encoded
+        "filters": filters.model_dump(mode="json"),
         "format": format,
         "active": True,
         "next_generation": next_gen.isoformat(),
@@ -317,7 +437,7 @@ async def schedule_report(
     supabase = get_supabase_client()
     
     # Store in database
-    schedule_response = supabase.table("report_schedules").insert(schedule).execute()
+    schedule_response = await asyncio.to_thread(supabase.table("report_schedules").insert(schedule).execute)
     
     if schedule_response.error:
         raise HTTPException(
@@ -6,6 +6,9 @@ from typing import Dict, List, Optional, Any
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime, timedelta
+from pydantic_core import to_json
+import asyncio
+import hashlib
 
 from app.services.supabase import get_supabase_client
 from app.schemas.order import (
@@ -45,6 +48,16 @@ DEFAULT_SHIPPING_METHODS = [
     }
 ]
 
+# The catalog is static, so the models are built once at import and looked up
+# by ID instead of being rebuilt and scanned on every call. Callers must treat
+# the returned models as read-only.
+_SHIPPING_METHODS = tuple(ShippingMethod(**method) for method in DEFAULT_SHIPPING_METHODS)
+_SHIPPING_METHODS_BY_ID = {method.id: method for method in _SHIPPING_METHODS}
+
+# Weak ETag for the catalog, derived from its content so it changes whenever
+# the catalog does
+SHIPPING_METHODS_ETAG = 'W/"sm-%s"' % hashlib.blake2b(to_json(_SHIPPING_METHODS), digest_size=8).hexdigest()
+
 
 async def get_shipping_methods() -> List[ShippingMethod]:
     """
@@ -54,18 +67,14 @@ async def get_shipping_methods() -> List[ShippingMethod]:
     """
     # For MVP, return the default shipping methods
     # In the future, this would fetch from database or external API
-    return [ShippingMethod(**method) for method in DEFAULT_SHIPPING_METHODS]
+    return list(_SHIPPING_METHODS)
 
 
 async def get_shipping_method_by_id(method_id: str) -> Optional[ShippingMethod]:
     """
     Get a specific shipping method by ID.
     """
-    methods = await get_shipping_methods()
-    for method in methods:
-        if method.id == method_id:
-            return method
-    return None
+    return _SHIPPING_METHODS_BY_ID.get(method_id)
 
 
 async def calculate_shipping_cost(
@@ -111,6 +120,13 @@ async def get_estimated_delivery_date(method_id: str) -> datetime:
             detail=f"Shipping method with ID '{method_id}' not found"
         )
     
+    return _estimate_delivery_date(method)
+
+
+def _estimate_delivery_date(method: ShippingMethod) -> datetime:
+    """
+    Calculate the estimated delivery date for an already resolved shipping method.
+    """
     # Calculate based on business days (excluding weekends)
     # For MVP, we'll use a simple calculation
     today = datetime.now()
@@ -140,8 +156,8 @@ async def apply_shipping_to_order(
             detail=f"Shipping method with ID '{method_id}' not found"
         )
     
-    # Calculate estimated delivery date
-    estimated_delivery = await get_estimated_delivery_date(method_id)
+    # Calculate estimated delivery date from the method resolved above
+    estimated_delivery = _estimate_delivery_date(method)
     
     # Update the order with shipping information
     update_data = {
@@ -152,7 +168,7 @@ async def apply_shipping_to_order(
         "fulfillment_status": "pending"
     }
     
-    response = supabase.table("orders").update(update_data).eq("id", str(order_id)).execute()
+    response = await asyncio.to_thread(supabase.table("orders").update(update_data).eq("id", str(order_id)).execute)
     
     if response.error:
         raise HTTPException(
@@ -174,6 +190,6 @@ async def apply_shipping_to_order(
         "is_internal": True
     }
     
-    supabase.table("order_notes").insert(note_data).execute()
+    await asyncio.to_thread(supabase.table("order_notes").insert(note_data).execute)
     
     return response.data[0] 
\ No newline at end of file
@@ -1,18 +1,46 @@
 from app.services.supabase import get_supabase_client
-from app.schemas.user import UserCreate, UserUpdate, ProducerProfileCreate, ProducerProfileUpdate
-from typing import Optional, Dict, List, Any
+from app.schemas.user import UserCreate, UserUpdate, UserResponse, ProducerProfileCreate, ProducerProfileUpdate
+from app.utils.cache import TTLCache
+from app.utils.pagination import encode_cursor, keyset_filter
+from typing import Optional, Dict, List, Any, Tuple
 from uuid import UUID
+import asyncio
 
 
 supabase = get_supabase_client()
 
+# Cache-aside for user rows and producer profiles, keyed by user ID. Writes
+# through this module invalidate both; other workers see changes within the TTL.
+# This is the only cache of user rows: the auth dependency in app.utils.auth
+# reads through get_user_by_id, so a role change or delete takes effect on the
+# caller's next request. Cached dicts are shared between requests and must be
+# treated as read-only.
+USER_CACHE_TTL_SECONDS = 60
+_user_cache = TTLCache(maxsize=10000, ttl=USER_CACHE_TTL_SECONDS)
+_profile_cache = TTLCache(maxsize=10000, ttl=USER_CACHE_TTL_SECONDS)
+
+# Columns the user list returns; anything else would be fetched only to be dropped
+_USER_LIST_COLUMNS = ",".join(UserResponse.model_fields)
+
+
+def invalidate_user(user_id: UUID) -> None:
+    """
+    Drop a user's cached row and producer profile.
+    
+    Args:
+        user_id: ID of the user that changed
+    """
+    key = str(user_id)
+    _user_cache.pop(key)
+    _profile_cache.pop(key)
+
 
 async def create_user(user_data: UserCreate) -> Dict[str, Any]:
     """
     Create a new user in the auth system and add user data to the users table.
     """
     # Create auth user
-    auth_user = supabase.auth.admin.create_user({
+    auth_user = await asyncio.to_thread(supabase.auth.admin.create_user, {
         "email": user_data.email,
         "password": user_data.password,
         "email_confirm": True
@@ -29,7 +57,7 @@ async def create_user(user_data: UserCreate) -> Dict[str, Any]:
         "role": "producer"  # Default role
     }
     
-    result = supabase.table("users").insert(user).execute()
+    result = await asyncio.to_thread(supabase.table("users").insert(user).execute)
     
     # Create producer profile
     producer_profile = {
@@ -38,7 +66,7 @@ async def create_user(user_data: UserCreate) -> Dict[str, Any]:
         "subscription_status": "active"
     }
     
-    supabase.table("producer_profiles").insert(producer_profile).execute()
+    await asyncio.to_thread(supabase.table("producer_profiles").insert(producer_profile).execute)
     
     return result.data[0]
 
@@ -47,19 +75,55 @@ async def get_user_by_id(user_id: UUID) -> Optional[Dict[str, Any]]:
     """
     Get a user by ID.
     """
-    result = supabase.table("users").select("*").eq("id", str(user_id)).execute()
+    key = str(user_id)
+    user = _user_cache.get(key)
+    if user is not None:
+        return user
+    
+    result = await asyncio.to_thread(supabase.table("users").select("*").eq("id", key).execute)
     
     if not result.data:
         return None
     
-    return result.data[0]
+    user = result.data[0]
+    _user_cache.set(key, user)
+    return user
+
+
+async def list_users(limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Get a page of users, newest first, using keyset pagination.
+    
+    Each page is a single range scan on (created_at, id), however deep it is.
+    
+    Args:
+        limit: Maximum number of users to return
+        cursor: Cursor returned with the previous page, if any
+        
+    Returns:
+        Tuple of (users, cursor for the next page or None on the last page)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = supabase.table("users").select(_USER_LIST_COLUMNS)
+    if cursor:
+        query = query.or_(keyset_filter(cursor))
+    
+    # Fetch one extra row to learn whether another page follows
+    query = query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1)
+    result = await asyncio.to_thread(query.execute)
+    
+    users = result.data[:limit]
+    next_cursor = encode_cursor(users[-1]) if len(result.data) > limit else None
+    return users, next_cursor
 
 
 async def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
     """
     Get a user by email.
     """
-    result = supabase.table("users").select("*").eq("email", email).execute()
+    result = await asyncio.to_thread(supabase.table("users").select("*").eq("email", email).execute)
     
     if not result.data:
         return None
@@ -67,36 +131,104 @@ async def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
     return result.data[0]
 
 
+async def email_exists(email: str) -> bool:
+    """
+    Check whether a user with the given email exists.
+    
+    Only the ID of at most one row is fetched, so the check never transfers
+    a full user record.
+    
+    Args:
+        email: Email address to look up
+        
+    Returns:
+        True if a user has this email
+    """
+    query = supabase.table("users").select("id").eq("email", email).limit(1)
+    result = await asyncio.to_thread(query.execute)
+    return bool(result.data)
+
+
 async def update_user(user_id: UUID, user_data: UserUpdate) -> Dict[str, Any]:
     """
     Update a user's data.
     """
-    data = {k: v for k, v in user_data.dict().items() if v is not None}
+    data = {k: v for k, v in user_data.model_dump().items() if v is not None}
+    
+    result = await asyncio.to_thread(supabase.table("users").update(data).eq("id", str(user_id)).execute)
+    invalidate_user(user_id)
+    
+    return result.data[0]
+
+
+async def update_user_role(user_id: UUID, role: str) -> Optional[Dict[str, Any]]:
+    """
+    Update a user's role.
+    
+    PostgREST returns the updated rows, so a missing user is detected from
+    the same round trip instead of a separate lookup.
+    
+    Args:
+        user_id: ID of the user to update
+        role: New role
+        
+    Returns:
+        The updated user, or None if no user has this ID
+    """
+    query = supabase.table("users").update({"role": role}).eq("id", str(user_id))
+    result = await asyncio.to_thread(query.execute)
+    invalidate_user(user_id)
     
-    result = supabase.table("users").update(data).eq("id", str(user_id)).execute()
+    if not result.data:
+        return None
     
     return result.data[0]
 
 
+async def delete_user(user_id: UUID) -> bool:
+    """
+    Delete a user's record.
+    
+    Args:
+        user_id: ID of the user to delete
+        
+    Returns:
+        True if a user was deleted, False if no user has this ID
+    """
+    query = supabase.table("users").delete().eq("id", str(user_id))
+    result = await asyncio.to_thread(query.execute)
+    invalidate_user(user_id)
+    
+    return bool(result.data)
+
+
 async def get_producer_profile(user_id: UUID) -> Optional[Dict[str, Any]]:
     """
     Get a producer profile by user ID.
     """
-    result = supabase.table("producer_profiles").select("*").eq("id", str(user_id)).execute()
+    key = str(user_id)
+    profile = _profile_cache.get(key)
+    if profile is not None:
+        return profile
+    
+    result = await asyncio.to_thread(supabase.table("producer_profiles").select("*").eq("id", key).execute)
     
     if not result.data:
         return None
     
-    return result.data[0]
+    profile = result.data[0]
+    _profile_cache.set(key, profile)
+    return profile
 
 
 async def update_producer_profile(user_id: UUID, profile_data: ProducerProfileUpdate) -> Dict[str, Any]:
     """
     Update a producer profile.
     """
-    data = {k: v for k, v in profile_data.dict().items() if v is not None}
+    data = {k: v for k, v in profile_data.model_dump().items() if v is not None}
     
-    result = supabase.table("producer_profiles").update(data).eq("id", str(user_id)).execute()
+    result = await asyncio.to_thread(supabase.table("producer_profiles").update(data).eq("id", str(user_id)).execute)
+    invalidate_user(user_id)
     
     return result.data[0]
 
@@ -105,12 +237,11 @@ async def get_user_with_profile(user_id: UUID) -> Optional[Dict[str, Any]]:
     """
     Get a user with their producer profile.
     """
-    user = await get_user_by_id(user_id)
+    user, profile = await asyncio.gather(get_user_by_id(user_id), get_producer_profile(user_id))
     
     if not user:
         return None
     
-    profile = await get_producer_profile(user_id)
     
     return {
         **user,
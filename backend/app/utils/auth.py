@@ -2,23 +2,74 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.services.supabase import get_supabase_client
 from app.services import user_service
+from app.utils.cache import TTLCache
 from typing import Optional
 from uuid import UUID
+import asyncio
+import hashlib
+import time
+import jwt
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 supabase = get_supabase_client()
 
+# Cache of verified tokens mapped to their user ID, so repeat requests with the
+# same token skip the Supabase auth round-trip. Entries never outlive the
+# token's own expiry. User rows are not cached here: they come from
+# user_service, whose per-ID cache invalidate_user clears on role changes and
+# deletes, so those take effect on the next request.
+TOKEN_CACHE_TTL_SECONDS = 60
+_token_user_ids = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+
+def _token_cache_key(token: str) -> bytes:
+    """
+    Build the cache key for a bearer token.
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _token_time_remaining(token: str) -> float:
+    """
+    Seconds until a token expires, or 0 if its expiry can't be read.
+    Only called after Supabase has verified the token, so the signature
+    isn't checked again.
+    """
+    try:
+        exp = jwt.decode(token, options={"verify_signature": False})["exp"]
+    except (jwt.PyJWTError, KeyError):
+        return 0
+    return exp - time.time()
+
+
+def invalidate_cached_user(token: str) -> None:
+    """
+    Drop the cached user for a token, e.g. after logout or a password change.
+    
+    Args:
+        token: Bearer token the user was resolved from
+    """
+    _token_user_ids.pop(_token_cache_key(token))
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     """
     Get the current authenticated user.
     """
+    cache_key = _token_cache_key(token)
+    
     try:
-        # Verify token and get user
-        user = supabase.auth.get_user(token)
-        user_id = user.user.id
+        user_id = _token_user_ids.get(cache_key)
+        if user_id is None:
+            # Verify token and get user
+            user = await asyncio.to_thread(supabase.auth.get_user, token)
+            user_id = UUID(user.user.id)
+            
+            remaining = _token_time_remaining(token)
+            if remaining > 0:
+                _token_user_ids.set(cache_key, user_id, ttl=remaining)
         
         # Get user from database
-        db_user = await user_service.get_user_by_id(UUID(user_id))
+        db_user = await user_service.get_user_by_id(user_id)
         
         if not db_user:
             raise HTTPException(
@@ -2,7 +2,8 @@
 Application configuration module.
 """
 import os
-from pydantic import BaseSettings, AnyHttpUrl, validator
+from pydantic import AnyHttpUrl, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional, List, Union, Any
 from pydantic import Field
 from dotenv import load_dotenv
@@ -17,22 +18,26 @@ class Settings(BaseSettings):
     """Application settings."""
     
     # Environment
-    ENVIRONMENT: str = Field(default="development", env="ENVIRONMENT")
+    ENVIRONMENT: str = Field(default="development")
     DEBUG: bool = ENVIRONMENT == "development"
     
     # API Configuration
-    API_HOST: str = Field(default="0.0.0.0", env="API_HOST")
-    API_PORT: int = Field(default=8000, env="PORT")
+    API_HOST: str = Field(default="0.0.0.0")
+    API_PORT: int = Field(default=8000, validation_alias="PORT")
+    # The rate limiter and report jobs keep their state in memory per process:
+    # N workers allow N times RATE_LIMIT_MAX_REQUESTS and can't poll each
+    # other's report jobs. Keep one worker until that state is shared.
+    WEB_CONCURRENCY: int = Field(default=1)
     
     # Frontend URLs
-    FRONTEND_URL: str = Field(default="http://localhost:5173", env="FRONTEND_URL")
+    FRONTEND_URL: str = Field(default="http://localhost:5173")
     
     # Rate Limiting
-    RATE_LIMIT_MAX_REQUESTS: int = Field(default=100, env="RATE_LIMIT_MAX_REQUESTS")
-    RATE_LIMIT_WINDOW_SECONDS: int = Field(default=60, env="RATE_LIMIT_WINDOW_SECONDS")
+    RATE_LIMIT_MAX_REQUESTS: int = Field(default=100)
+    RATE_LIMIT_WINDOW_SECONDS: int = Field(default=60)
     
     # Logging
-    LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
+    LOG_LEVEL: str = Field(default="INFO")
     
     # CORS Configuration
     CORS_ORIGINS: List[str] = [
@@ -41,7 +46,8 @@ class Settings(BaseSettings):
         "http://localhost:5175"
     ]
     
-    @validator("CORS_ORIGINS", pre=True)
+    @field_validator("CORS_ORIGINS", mode="before")
+    @classmethod
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> List[str]:
         """
         Parse CORS_ORIGINS from string or list.
@@ -59,31 +65,33 @@ class Settings(BaseSettings):
         raise ValueError(v)
     
     # Database Configuration
-    SUPABASE_URL: str = Field(..., env="SUPABASE_URL")
-    SUPABASE_KEY: str = Field(..., env="SUPABASE_KEY")
+    SUPABASE_URL: str = Field(...)
+    SUPABASE_KEY: str = Field(...)
+    DB_POOL_MAX_CONNECTIONS: int = Field(default=50)
+    DB_POOL_KEEPALIVE_SECONDS: float = Field(default=300)
     
     # API Version
     API_VERSION: str = "v1"
     
     # Security
-    JWT_SECRET: str = Field(..., env="JWT_SECRET")
-    JWT_ALGORITHM: str = Field(default="HS256", env="JWT_ALGORITHM")
-    JWT_EXPIRATION_MINUTES: int = Field(default=60, env="JWT_EXPIRATION_MINUTES")
+    JWT_SECRET: str = Field(...)
+    JWT_ALGORITHM: str = Field(default="HS256")
+    JWT_EXPIRATION_MINUTES: int = Field(default=60)
     
     # Email Settings
-    SMTP_HOST: Optional[str] = Field(..., env="SMTP_HOST")
-    SMTP_PORT: int = Field(default=587, env="SMTP_PORT")
-    SMTP_USER: Optional[str] = Field(..., env="SMTP_USER")
-    SMTP_PASSWORD: Optional[str] = Field(..., env="SMTP_PASSWORD")
-    EMAILS_FROM_EMAIL: Optional[str] = Field(..., env="EMAILS_FROM_EMAIL")
-    EMAILS_FROM_NAME: Optional[str] = Field(..., env="EMAILS_FROM_NAME")
+    SMTP_HOST: Optional[str] = Field(...)
+    SMTP_PORT: int = Field(default=587)
+    SMTP_USER: Optional[str] = Field(...)
+    SMTP_PASSWORD: Optional[str] = Field(...)
+    EMAILS_FROM_EMAIL: Optional[str] = Field(...)
+    EMAILS_FROM_NAME: Optional[str] = Field(...)
     
-    class Config:
-        """Pydantic configuration."""
-        
-        case_sensitive = True
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    model_config = SettingsConfigDict(
+        case_sensitive=True,
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore"
+    )
 
 
 def get_settings() -> Settings:
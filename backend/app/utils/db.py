@@ -2,7 +2,11 @@
 Database utility module for Supabase connection.
 """
 from typing import Optional, List, Dict, Any, Union
-from supabase import create_client, Client
+from httpx import Limits, Timeout
+from postgrest import SyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_TIMEOUT
+from postgrest.utils import SyncClient
+from supabase import Client
 from .logging import setup_logger
 import asyncio
 
@@ -12,6 +16,31 @@ from .config import settings
 # Set up logger
 logger = setup_logger(__name__)
 
+# Connection pool shared by every request made through the PostgREST client.
+# Requests run in worker threads, so keep enough idle connections alive for
+# them to reuse instead of reconnecting.
+_POOL_LIMITS = Limits(
+    max_connections=settings.DB_POOL_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.DB_POOL_MAX_CONNECTIONS,
+    keepalive_expiry=settings.DB_POOL_KEEPALIVE_SECONDS
+)
+
+
+class _PooledPostgrestClient(SyncPostgrestClient):
+    """PostgREST client whose HTTP session uses the shared pool limits."""
+
+    def create_session(self, base_url: str, headers: Dict[str, str], timeout: Union[int, float, Timeout]) -> SyncClient:
+        return SyncClient(base_url=base_url, headers=headers, timeout=timeout, limits=_POOL_LIMITS)
+
+
+class _PooledClient(Client):
+    """Supabase client that builds its PostgREST client with the shared pool limits."""
+
+    @staticmethod
+    def _init_postgrest_client(rest_url: str, headers: Dict[str, str], schema: str, timeout: Union[int, float, Timeout] = DEFAULT_POSTGREST_CLIENT_TIMEOUT) -> SyncPostgrestClient:
+        return _PooledPostgrestClient(rest_url, headers=headers, schema=schema, timeout=timeout)
+
+
 # Create Supabase client
 _supabase_client: Optional[Client] = None
 
@@ -35,7 +64,7 @@ def get_supabase_client() -> Client:
         
         try:
             logger.info(f"Initializing Supabase client with URL: {settings.SUPABASE_URL}")
-            _supabase_client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
+            _supabase_client = _PooledClient(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
             logger.info("Supabase client initialized successfully")
         except Exception as e:
             error_msg = f"Failed to initialize Supabase client: {str(e)}"
@@ -70,13 +99,15 @@ async def execute_query(query: str, params: List[Any] = None) -> None:
         # Use Supabase's rpc function to execute raw SQL
         # This wraps the query into a function call
         function_name = "execute_sql"
-        result = client.rpc(
+        # The client is synchronous; run the request in a worker thread so the
+        # event loop isn't blocked while waiting on the network
+        result = await asyncio.to_thread(client.rpc(
             function_name,
             { 
                 "query_text": query,
                 "params": params or []
             }
-        ).execute()
+        ).execute)
         
         if hasattr(result, 'error') and result.error:
             raise Exception(f"Query execution error: {result.error}")
@@ -105,13 +136,13 @@ async def fetch_one(query: str, params: List[Any] = None) -> Optional[Dict[str,
         logger.debug(f"Fetching one row with query: {query} with params: {params}")
         # Use Supabase's rpc function to execute raw SQL
         function_name = "execute_sql_fetch"
-        result = client.rpc(
+        result = await asyncio.to_thread(client.rpc(
             function_name,
             { 
                 "query_text": query,
                 "params": params or []
             }
-        ).execute()
+        ).execute)
         
         if hasattr(result, 'error') and result.error:
             raise Exception(f"Query execution error: {result.error}")
@@ -146,13 +177,13 @@ async def fetch_all(query: str, params: List[Any] = None) -> List[Dict[str, Any]
         logger.debug(f"Fetching all rows with query: {query} with params: {params}")
         # Use Supabase's rpc function to execute raw SQL
         function_name = "execute_sql_fetch"
-        result = client.rpc(
+        result = await asyncio.to_thread(client.rpc(
             function_name,
             { 
                 "query_text": query,
                 "params": params or []
             }
-        ).execute()
+        ).execute)
         
         if hasattr(result, 'error') and result.error:
             raise Exception(f"Query execution error: {result.error}")
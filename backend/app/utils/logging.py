@@ -3,7 +3,43 @@ Logging utilities for the application.
 """
 import logging
 import os
-from typing import Optional
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+import orjson
+
+# ID of the request being handled; set by the request logger middleware
+REQUEST_ID: ContextVar[str] = ContextVar("request_id", default="unknown")
+
+# Attributes present on every LogRecord; anything else was passed via ``extra``
+_RESERVED_RECORD_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime"}
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formatter that renders records as single-line JSON using orjson.
+    Fields passed via ``extra`` are emitted as top-level keys, so structured
+    data is only serialized when a record is actually written. Every record
+    is stamped with the current request ID.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "time": self.formatTime(record),
+            "name": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "request_id": REQUEST_ID.get(),
+        }
+        
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_ATTRS:
+                data[key] = value
+        
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        
+        return orjson.dumps(data, default=str).decode()
 
 def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """
@@ -13,6 +49,10 @@ def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
         name: Name of the logger
         level: Logging level (defaults to value from environment or INFO)
         
+    The output format is plain text unless LOG_FORMAT=json is set. It is read
+    from the environment rather than settings, since loading the settings
+    already logs through this function.
+        
     Returns:
         Configured logger instance
     """
@@ -26,9 +66,12 @@ def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     # Avoid adding handlers if they already exist
     if not logger.handlers:
         handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        if os.getenv("LOG_FORMAT", "text").lower() == "json":
+            formatter = JSONFormatter()
+        else:
+            formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
         handler.setFormatter(formatter)
         logger.addHandler(handler)
     
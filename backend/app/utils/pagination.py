@@ -0,0 +1,73 @@
+"""
+Pagination utilities.
+This module provides opaque cursors for keyset pagination over rows ordered
+newest first by (created_at, id).
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Dict, Tuple
+from uuid import UUID
+
+import orjson
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """
+    Encode the position of a row as an opaque cursor.
+
+    Args:
+        row: The last row of a page; must have "created_at" and "id"
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = orjson.dumps({"created_at": row["created_at"], "id": row["id"]})
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    The values are parsed and re-rendered, so they are safe to embed in a
+    PostgREST filter.
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        Tuple of (created_at as ISO 8601, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        created_at = datetime.fromisoformat(payload["created_at"]).isoformat()
+        row_id = str(UUID(payload["id"]))
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+    return created_at, row_id
+
+
+def keyset_filter(cursor: str) -> str:
+    """
+    Build a PostgREST ``or`` filter selecting the rows after a cursor.
+
+    Rows are expected in descending (created_at, id) order, so the next page
+    starts at the first row strictly older than the cursor, with the ID
+    breaking ties between equal timestamps.
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        Filter string for ``query.or_(...)``
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at, row_id = decode_cursor(cursor)
+    return f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id})'
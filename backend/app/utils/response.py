@@ -3,8 +3,96 @@ API response formatting utilities.
 This module provides standardized response formatting for all API endpoints.
 """
 from typing import Any, Dict, List, Optional, Union
-from fastapi.responses import JSONResponse
-from fastapi import status
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi import Response, status
+import hashlib
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(ORJSONResponse):
+    """
+    JSON response that serializes Pydantic models directly with pydantic-core.
+    
+    Returning this from a route skips FastAPI's response_model round-trip
+    (dump to dict, re-validate, encode). Only use it when the content already
+    is the declared response model, which still documents the endpoint.
+    """
+    
+    def __init__(self, content: Any, adapter: Optional[TypeAdapter] = None, **kwargs: Any):
+        """
+        Initialize the response.
+        
+        Args:
+            content: Model, or list of models, to serialize
+            adapter: Optional prebuilt TypeAdapter for the content type; its
+                compiled serializer is used instead of inspecting types per call
+            **kwargs: Passed on to ORJSONResponse
+        """
+        # render() runs inside the parent constructor, so set this first
+        self.adapter = adapter
+        super().__init__(content, **kwargs)
+    
+    def render(self, content: Any) -> bytes:
+        if self.adapter is not None:
+            return self.adapter.dump_json(content)
+        return to_json(content)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag using weak comparison.
+    
+    Args:
+        if_none_match: Value of the If-None-Match request header, if any
+        etag: Current ETag of the resource
+        
+    Returns:
+        True if the client's cached copy is still current
+    """
+    if not if_none_match:
+        return False
+    
+    if if_none_match.strip() == "*":
+        return True
+    
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque_tag:
+            return True
+    return False
+
+
+def conditional_json_response(
+    body: bytes,
+    if_none_match: Optional[str],
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Build a JSON response tagged with an ETag derived from its content.
+    
+    Clients that send the current tag back in If-None-Match get an empty 304
+    instead of the body. The responses depend on the caller, so they are
+    marked private and must be revalidated before reuse.
+    
+    Args:
+        body: Serialized JSON body
+        if_none_match: Value of the If-None-Match request header, if any
+        headers: Optional extra response headers
+        
+    Returns:
+        A 200 response with the body, or a 304 if the client's copy is current
+    """
+    etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+    response_headers = {"Cache-Control": "private, no-cache", **(headers or {}), "ETag": etag}
+    
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=response_headers)
+    return Response(content=body, media_type="application/json", headers=response_headers)
+
 
 def success_response(
     data: Any = None, 
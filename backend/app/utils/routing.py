@@ -0,0 +1,109 @@
+"""
+Routing utilities for the application.
+This module provides a route class that validates JSON request bodies in a
+single pass.
+"""
+from typing import Any, Callable, Coroutine, Optional
+from typing_extensions import Annotated
+from fastapi import Request, Response, params
+from fastapi.dependencies.utils import get_dependant
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute, get_request_handler, request_response
+from pydantic import TypeAdapter, ValidationError
+
+
+class JSONBodyRoute(APIRoute):
+    """
+    APIRoute that validates a single JSON body with ``validate_json``.
+
+    FastAPI normally parses the body with ``json.loads`` and then validates the
+    resulting Python objects. For routes whose only body parameter is required and
+    not embedded (a model, or a free-form type such as ``Dict[str, str]``), this
+    route hands the raw bytes straight to pydantic-core instead, so the
+    intermediate objects are never built. All other routes behave exactly like
+    APIRoute. The OpenAPI schema is unaffected.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, endpoint, **kwargs)
+
+        self.body_adapter = self._get_body_adapter()
+        if self.body_adapter is None:
+            return
+
+        # Replace the body parameter with a dependency that validates the raw bytes
+        body_param = self.dependant.body_params[0]
+        self.dependant.body_params = []
+        self.dependant.dependencies.append(
+            get_dependant(
+                path=self.path_format,
+                call=self._make_body_reader(self.body_adapter),
+                name=body_param.name
+            )
+        )
+
+        # Rebuild the ASGI app now that the dependant has changed
+        self.app = request_response(self.get_route_handler())
+
+    def _get_body_adapter(self) -> Optional[TypeAdapter]:
+        """
+        Get a validator for the single JSON body parameter, if there is one.
+
+        Returns:
+            TypeAdapter for the body, or None if the route doesn't qualify
+        """
+        body_params = self.dependant.body_params
+        if len(body_params) != 1:
+            return None
+
+        field = body_params[0]
+        field_info = field.field_info
+        if not field.required or isinstance(field_info, params.Form) or getattr(field_info, "embed", False):
+            return None
+
+        # Same validator FastAPI builds for the field, so constraints declared
+        # with Body(...) still apply
+        return TypeAdapter(Annotated[field_info.annotation, field_info])
+
+    @staticmethod
+    def _make_body_reader(adapter: TypeAdapter) -> Callable[[Request], Coroutine[Any, Any, Any]]:
+        """
+        Build a dependency that validates the request body with ``adapter``.
+
+        Args:
+            adapter: Validator for the body type
+
+        Returns:
+            Async dependency callable
+        """
+        async def read_body(request: Request) -> Any:
+            body = await request.body()
+            try:
+                return adapter.validate_json(body)
+            except ValidationError as e:
+                raise RequestValidationError(
+                    [{**error, "loc": ("body", *error["loc"])} for error in e.errors()],
+                    body=body
+                )
+
+        return read_body
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        # Without the body adapter the default handler reads and parses the body itself
+        if getattr(self, "body_adapter", None) is None:
+            return super().get_route_handler()
+
+        return get_request_handler(
+            dependant=self.dependant,
+            body_field=None,
+            status_code=self.status_code,
+            response_class=self.response_class,
+            response_field=self.secure_cloned_response_field,
+            response_model_include=self.response_model_include,
+            response_model_exclude=self.response_model_exclude,
+            response_model_by_alias=self.response_model_by_alias,
+            response_model_exclude_unset=self.response_model_exclude_unset,
+            response_model_exclude_defaults=self.response_model_exclude_defaults,
+            response_model_exclude_none=self.response_model_exclude_none,
+            dependency_overrides_provider=self.dependency_overrides_provider,
+        )
@@ -0,0 +1,103 @@
+"""
+Tests for the Supabase-backed auth dependency.
+"""
+import pytest
+import time
+import uuid
+import jwt
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock, MagicMock
+
+# Both modules create their Supabase client on import
+with patch("app.services.supabase.get_supabase_client", return_value=MagicMock()):
+    from app.services import user_service
+    from app.utils import auth
+
+
+TEST_UUID = uuid.uuid4()
+
+
+def _token(expires_in: float) -> str:
+    """Build a token that expires after the given number of seconds."""
+    return jwt.encode({"sub": str(TEST_UUID), "exp": int(time.time() + expires_in)}, "secret")
+
+
+@pytest.fixture(autouse=True)
+def supabase_auth():
+    """Resolve every token to the test user and start from empty caches."""
+    auth._token_user_ids.clear()
+    user_service._user_cache.clear()
+    with patch.object(auth, "supabase") as client:
+        client.auth.get_user.return_value = SimpleNamespace(user=SimpleNamespace(id=str(TEST_UUID)))
+        yield client
+    auth._token_user_ids.clear()
+    user_service._user_cache.clear()
+
+
+class TestGetCurrentUser:
+    """Tests for get_current_user."""
+
+    @pytest.mark.asyncio
+    async def test_token_is_verified_once(self, supabase_auth):
+        """Test that repeat requests with a token skip the Supabase auth call."""
+        token = _token(3600)
+        user = {"id": str(TEST_UUID), "role": "producer"}
+        with patch.object(user_service, "get_user_by_id", AsyncMock(return_value=user)):
+            assert await auth.get_current_user(token) == user
+            assert await auth.get_current_user(token) == user
+
+        supabase_auth.auth.get_user.assert_called_once_with(token)
+
+    @pytest.mark.asyncio
+    async def test_cache_entry_never_outlives_token(self, supabase_auth):
+        """Test that a token about to expire is cached only until its expiry."""
+        token = _token(5)
+        user = {"id": str(TEST_UUID), "role": "producer"}
+        with patch.object(user_service, "get_user_by_id", AsyncMock(return_value=user)):
+            await auth.get_current_user(token)
+
+        _, expires_at = auth._token_user_ids._data[auth._token_cache_key(token)]
+        assert expires_at <= time.monotonic() + 5
+
+
+class TestUserInvalidation:
+    """Tests that user_service writes reach the auth dependency."""
+
+    @pytest.fixture
+    def users_table(self):
+        """Serve user rows from a mocked users table."""
+        with patch.object(user_service, "supabase") as client:
+            yield client.table.return_value
+
+    @pytest.mark.asyncio
+    async def test_role_change_applies_to_next_request(self, users_table):
+        """Test that a demoted admin loses the role on their next request."""
+        token = _token(3600)
+        users_table.select.return_value.eq.return_value.execute.return_value.data = [
+            {"id": str(TEST_UUID), "role": "admin"}
+        ]
+        assert (await auth.get_current_user(token))["role"] == "admin"
+
+        demoted = {"id": str(TEST_UUID), "role": "producer"}
+        users_table.update.return_value.eq.return_value.execute.return_value.data = [demoted]
+        users_table.select.return_value.eq.return_value.execute.return_value.data = [demoted]
+        await user_service.update_user_role(TEST_UUID, "producer")
+
+        assert (await auth.get_current_user(token))["role"] == "producer"
+
+    @pytest.mark.asyncio
+    async def test_deleted_user_is_rejected(self, users_table):
+        """Test that a deleted user's token stops working immediately."""
+        token = _token(3600)
+        users_table.select.return_value.eq.return_value.execute.return_value.data = [
+            {"id": str(TEST_UUID), "role": "admin"}
+        ]
+        await auth.get_current_user(token)
+
+        users_table.delete.return_value.eq.return_value.execute.return_value.data = [{"id": str(TEST_UUID)}]
+        users_table.select.return_value.eq.return_value.execute.return_value.data = []
+        assert await user_service.delete_user(TEST_UUID)
+
+        with pytest.raises(auth.HTTPException) as exc_info:
+            await auth.get_current_user(token)
+        assert exc_info.value.status_code == 401
@@ -0,0 +1,89 @@
+"""
+Tests for the in-process TTL cache.
+"""
+import pytest
+from unittest.mock import patch
+from app.utils.cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for the TTLCache utility."""
+
+    def test_get_and_set(self):
+        """Test storing and reading a value."""
+        cache = TTLCache(maxsize=10, ttl=30)
+        cache.set("key", {"sub": "user"})
+
+        assert cache.get("key") == {"sub": "user"}
+        assert cache.get("missing") is None
+        assert cache.get("missing", "default") == "default"
+
+    def test_entries_expire(self):
+        """Test that entries are dropped once their TTL has passed."""
+        cache = TTLCache(maxsize=10, ttl=30)
+
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value", ttl=5)
+
+        with patch("app.utils.cache.time.monotonic", return_value=104.0):
+            assert cache.get("key") == "value"
+
+        with patch("app.utils.cache.time.monotonic", return_value=106.0):
+            assert cache.get("key") is None
+
+        assert len(cache) == 0
+
+    def test_per_entry_ttl_is_capped(self):
+        """Test that a per-entry TTL never exceeds the default TTL."""
+        cache = TTLCache(maxsize=10, ttl=30)
+
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value", ttl=3600)
+
+        with patch("app.utils.cache.time.monotonic", return_value=131.0):
+            assert cache.get("key") is None
+
+    def test_non_positive_ttl_is_not_stored(self):
+        """Test that already-expired entries are never cached."""
+        cache = TTLCache(maxsize=10, ttl=30)
+        cache.set("key", "value", ttl=0)
+
+        assert cache.get("key") is None
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = TTLCache(maxsize=2, ttl=30)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # Touch "a" so that "b" becomes the least recently used entry
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_pop_and_clear(self):
+        """Test removing entries."""
+        cache = TTLCache(maxsize=10, ttl=30)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert cache.pop("a") == 1
+        assert cache.pop("a") is None
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_pop_expired_entry(self):
+        """Test that popping an expired entry removes it but returns the default."""
+        cache = TTLCache(maxsize=10, ttl=30)
+
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value", ttl=5)
+
+        with patch("app.utils.cache.time.monotonic", return_value=106.0):
+            assert cache.pop("key", "default") == "default"
+
+        assert len(cache) == 0
@@ -0,0 +1,49 @@
+"""
+Tests for the application setup.
+"""
+import pytest
+from unittest.mock import patch
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+from app.middleware.error_handler import UnhandledErrorMiddleware
+from app.middleware.rate_limiter import RateLimiterMiddleware
+from app.middleware.request_logger import RequestLoggerMiddleware
+
+# Only the middleware stack is under test, so skip loading the routers
+with patch("app.routes.setup_routes"):
+    from app.main import app
+
+
+@app.get("/test-unhandled-error")
+async def raise_unhandled_error():
+    raise RuntimeError("password=hunter2")
+
+
+@pytest.fixture
+def client():
+    """Create a test client that returns server errors as responses."""
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_middleware_order():
+    """Test that each middleware is registered once, outermost first."""
+    assert [middleware.cls for middleware in app.user_middleware] == [
+        CORSMiddleware,
+        RateLimiterMiddleware,
+        RequestLoggerMiddleware,
+        UnhandledErrorMiddleware,
+    ]
+
+
+def test_unhandled_error_keeps_cors_and_request_id(client):
+    """Test that a 500 passes back through CORS and the request logger."""
+    response = client.get("/test-unhandled-error", headers={"Origin": "http://localhost:5173"})
+
+    assert response.status_code == 500
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+    assert response.json() == {
+        "success": False,
+        "message": "Internal Server Error",
+        "request_id": response.headers["x-request-id"]
+    }
+    assert "hunter2" not in response.text
@@ -0,0 +1,36 @@
+"""
+Tests for the Orders API routes.
+"""
+import pytest
+import uuid
+from unittest.mock import patch, AsyncMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routes import orders
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the orders router."""
+    app = FastAPI()
+    app.include_router(orders.router, prefix="/orders")
+    return TestClient(app)
+
+
+class TestOrderAuthentication:
+    """Tests that order lookups only run for authenticated requests."""
+
+    @pytest.mark.parametrize("method,path,body", [
+        ("GET", "/orders/{id}", None),
+        ("GET", "/orders/{id}/timeline", None),
+        ("PUT", "/orders/{id}", {"notes": "hi"}),
+        ("POST", "/orders/{id}/notes", {"content": "hi"}),
+    ])
+    def test_unauthenticated_requests_do_not_load_order(self, client, method, path, body):
+        """Test that missing credentials are rejected before the order is fetched."""
+        get_order = AsyncMock(return_value={})
+        with patch.object(orders, "get_order_by_id", get_order):
+            response = client.request(method, path.format(id=uuid.uuid4()), json=body)
+
+        assert response.status_code in (401, 403)
+        get_order.assert_not_awaited()
@@ -0,0 +1,33 @@
+"""
+Tests for the pagination utilities.
+"""
+import pytest
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_filter
+
+
+ROW = {"created_at": "2024-05-08T10:00:00+00:00", "id": "123e4567-e89b-12d3-a456-426614174000"}
+
+
+class TestCursors:
+    """Tests for keyset cursors."""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to the row's position."""
+        assert decode_cursor(encode_cursor(ROW)) == (ROW["created_at"], ROW["id"])
+
+    def test_keyset_filter(self):
+        """Test that the filter selects rows strictly after the cursor."""
+        assert keyset_filter(encode_cursor(ROW)) == (
+            'created_at.lt."2024-05-08T10:00:00+00:00",'
+            'and(created_at.eq."2024-05-08T10:00:00+00:00",id.lt.123e4567-e89b-12d3-a456-426614174000)'
+        )
+
+    @pytest.mark.parametrize("cursor", [
+        "not a cursor",
+        encode_cursor({"created_at": "yesterday", "id": ROW["id"]}),
+        encode_cursor({"created_at": ROW["created_at"], "id": "1),or(id.gt.0"}),
+    ])
+    def test_malformed_cursor(self, cursor):
+        """Test that malformed or tampered cursors are rejected."""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
@@ -0,0 +1,68 @@
+"""
+Tests for the Products API routes.
+"""
+import pytest
+import uuid
+from unittest.mock import patch, AsyncMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware.auth import require_permission
+from app.routes import products
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the products router with permissions granted."""
+    app = FastAPI()
+    app.include_router(products.router, prefix="/products")
+    for permission in ("read:products", "read:inventory", "create:products"):
+        app.dependency_overrides[require_permission(permission)] = lambda: {"id": "u1", "role": "admin"}
+
+    products._categories_cache.clear()
+    yield TestClient(app)
+    products._categories_cache.clear()
+
+
+class TestStaticProductRoutes:
+    """Tests for routes that share a prefix with /{product_id}."""
+
+    def test_get_categories_supports_etag(self, client):
+        """Test that /categories is routed and revalidates with If-None-Match."""
+        with patch.object(products.product_service, "get_categories", AsyncMock(return_value=["Fruit"])):
+            response = client.get("/products/categories")
+
+            assert response.status_code == 200
+            assert response.json() == ["Fruit"]
+
+            response = client.get("/products/categories", headers={"If-None-Match": response.headers["etag"]})
+
+            assert response.status_code == 304
+
+    def test_get_inventory(self, client):
+        """Test that /inventory is not captured as a product ID."""
+        inventory = [{"id": "p1", "stock_quantity": 3}]
+        with patch.object(products.product_service, "get_inventory", AsyncMock(return_value=inventory)):
+            response = client.get("/products/inventory")
+
+        assert response.status_code == 200
+        assert response.json() == inventory
+
+    def test_product_changes_refresh_categories(self, client):
+        """Test that creating a product drops the cached category list."""
+        with patch.object(products.product_service, "get_categories", AsyncMock(side_effect=[["Fruit"], ["Fruit", "Nuts"]])):
+            assert client.get("/products/categories").json() == ["Fruit"]
+
+            product = {
+                "id": str(uuid.uuid4()),
+                "producer_id": str(uuid.uuid4()),
+                "name": "Almonds",
+                "price": "10",
+                "category": "Nuts",
+                "created_at": "2023-01-01T00:00:00",
+                "updated_at": "2023-01-01T00:00:00"
+            }
+            with patch.object(products.product_service, "create_product", AsyncMock(return_value=product)):
+                response = client.post("/products/", json={"name": "Almonds", "price": "10", "category": "Nuts"})
+                assert response.status_code == 201
+
+            assert client.get("/products/categories").json() == ["Fruit", "Nuts"]
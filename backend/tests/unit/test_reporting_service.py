@@ -0,0 +1,59 @@
+"""
+Tests for background report jobs in the reporting service.
+"""
+import pytest
+from unittest.mock import patch, AsyncMock
+from app.schemas.fulfillment import FulfillmentReportFilters
+from app.services import reporting_service
+
+
+@pytest.fixture(autouse=True)
+def clear_report_state():
+    """Reset the module-level job state around each test."""
+    reporting_service._report_cache.clear()
+    reporting_service._report_failures.clear()
+    yield
+    reporting_service._report_cache.clear()
+    reporting_service._report_failures.clear()
+
+
+async def _finish(job_id):
+    """Wait for a started job to complete."""
+    await reporting_service._report_jobs[job_id]
+
+
+class TestReportJobs:
+    """Tests for starting and polling report jobs."""
+
+    @pytest.mark.asyncio
+    async def test_job_result_is_cached(self):
+        """Test that a finished job is served from the cache."""
+        generator = AsyncMock(return_value={"total": 1})
+        with patch.dict(reporting_service._REPORT_GENERATORS, {"metrics": generator}):
+            job_id, payload = reporting_service.start_report_job("metrics", FulfillmentReportFilters())
+            assert payload is None
+            assert reporting_service.get_report_job_result(job_id) == ("pending", None)
+
+            await _finish(job_id)
+
+        assert reporting_service.get_report_job_result(job_id) == ("ready", b'{"total":1}')
+
+    @pytest.mark.asyncio
+    async def test_failed_job_is_reported_and_retried(self):
+        """Test that a failure is visible to pollers and a new request retries."""
+        generator = AsyncMock(side_effect=RuntimeError("boom"))
+        with patch.dict(reporting_service._REPORT_GENERATORS, {"metrics": generator}):
+            job_id, _ = reporting_service.start_report_job("metrics", FulfillmentReportFilters())
+            await _finish(job_id)
+
+            assert reporting_service.get_report_job_result(job_id) == ("failed", None)
+
+            reporting_service.start_report_job("metrics", FulfillmentReportFilters())
+            assert reporting_service.get_report_job_result(job_id) == ("pending", None)
+            await _finish(job_id)
+
+        assert generator.await_count == 2
+
+    def test_unknown_job(self):
+        """Test that unknown job IDs have no status."""
+        assert reporting_service.get_report_job_result("missing") == (None, None)
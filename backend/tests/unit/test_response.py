@@ -0,0 +1,61 @@
+"""
+Tests for the response helpers.
+"""
+import pytest
+from app.utils.response import conditional_json_response, etag_matches
+
+
+class TestEtagMatches:
+    """Tests for If-None-Match comparison."""
+
+    @pytest.mark.parametrize("if_none_match", [
+        'W/"sm-1"',
+        '"sm-1"',
+        '"other", W/"sm-1"',
+        '*',
+    ])
+    def test_matching_headers(self, if_none_match):
+        """Test that current tags match using weak comparison."""
+        assert etag_matches(if_none_match, 'W/"sm-1"')
+
+    @pytest.mark.parametrize("if_none_match", [
+        None,
+        '',
+        'W/"sm-2"',
+        '"other", "sm-10"',
+    ])
+    def test_non_matching_headers(self, if_none_match):
+        """Test that missing or stale tags don't match."""
+        assert not etag_matches(if_none_match, 'W/"sm-1"')
+
+
+class TestConditionalJSONResponse:
+    """Tests for content-tagged JSON responses."""
+
+    def test_returns_body_with_etag(self):
+        """Test that a fresh request gets the body and its tag."""
+        response = conditional_json_response(b'["a"]', None)
+
+        assert response.status_code == 200
+        assert response.body == b'["a"]'
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    def test_matching_tag_returns_304(self):
+        """Test that resending the current tag skips the body."""
+        etag = conditional_json_response(b'["a"]', None).headers["etag"]
+
+        response = conditional_json_response(b'["a"]', etag)
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == etag
+
+    def test_changed_body_returns_200(self):
+        """Test that a stale tag gets the new body."""
+        etag = conditional_json_response(b'["a"]', None).headers["etag"]
+
+        response = conditional_json_response(b'["a", "b"]', etag)
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
@@ -0,0 +1,91 @@
+"""
+Tests for the JSON body route class.
+"""
+import pytest
+from typing import Dict, Optional
+from fastapi import APIRouter, Body, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from app.utils.routing import JSONBodyRoute
+
+
+class Item(BaseModel):
+    name: str
+    quantity: int
+    note: Optional[str] = None
+
+
+@pytest.fixture
+def client():
+    """Create a test client with JSONBodyRoute routes."""
+    router = APIRouter(route_class=JSONBodyRoute)
+
+    @router.post("/items")
+    async def create_item(item: Item, dry_run: bool = False):
+        return {"item": item.model_dump(), "dry_run": dry_run}
+
+    @router.post("/labels")
+    async def labels(data: Dict[str, str] = Body(...)):
+        return data
+
+    @router.post("/embedded")
+    async def embedded(name: str = Body(..., embed=True)):
+        return {"name": name}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+class TestJSONBodyRoute:
+    """Tests for JSONBodyRoute."""
+
+    def test_single_model_body_is_validated(self, client):
+        """Test that a model body is parsed and validated."""
+        response = client.post("/items?dry_run=true", json={"name": "Apple", "quantity": "3"})
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "item": {"name": "Apple", "quantity": 3, "note": None},
+            "dry_run": True
+        }
+
+    def test_invalid_body_returns_422(self, client):
+        """Test that validation errors are reported against the body."""
+        response = client.post("/items", json={"name": "Apple", "quantity": "many"})
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "quantity"]
+
+    def test_malformed_json_returns_422(self, client):
+        """Test that malformed JSON is reported as a validation error."""
+        response = client.post("/items", content=b"{not json")
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "json_invalid"
+
+    def test_free_form_body_is_validated(self, client):
+        """Test that a non-model body is validated from the raw bytes."""
+        response = client.post("/labels", json={"status": "processing"})
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "processing"}
+
+        response = client.post("/labels", json={"status": 1})
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "status"]
+
+    def test_other_bodies_use_default_handling(self, client):
+        """Test that routes without a single model body are unaffected."""
+        response = client.post("/embedded", json={"name": "Apple"})
+
+        assert response.status_code == 200
+        assert response.json() == {"name": "Apple"}
+
+    def test_openapi_schema_keeps_request_body(self, client):
+        """Test that the request body is still documented."""
+        schema = client.app.openapi()
+
+        request_body = schema["paths"]["/items"]["post"]["requestBody"]
+        assert request_body["content"]["application/json"]["schema"]["$ref"].endswith("/Item")
@@ -0,0 +1,64 @@
+"""
+Tests for the Users API routes.
+"""
+import pytest
+import uuid
+from unittest.mock import patch, AsyncMock, MagicMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware.auth import get_current_user
+
+# user_service creates its Supabase client on import
+with patch("app.services.supabase.get_supabase_client", return_value=MagicMock()):
+    from app.routes import users
+
+
+TEST_UUID = uuid.uuid4()
+TEST_USER = {
+    "id": str(TEST_UUID),
+    "email": "test@example.com",
+    "full_name": "Test User",
+    "company_name": None,
+    "role": "producer",
+    "created_at": "2023-01-01T00:00:00",
+    "updated_at": "2023-01-01T00:00:00"
+}
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the users router with an authenticated user."""
+    app = FastAPI()
+    app.include_router(users.router)
+    app.dependency_overrides[get_current_user] = lambda: {
+        "id": str(TEST_UUID),
+        "id_uuid": TEST_UUID,
+        "email": TEST_USER["email"],
+        "role": TEST_USER["role"]
+    }
+    return TestClient(app)
+
+
+class TestMyProfileRoutes:
+    """Tests for the /users/me routes."""
+
+    def test_get_my_profile_supports_etag(self, client):
+        """Test that /me loads the user row and revalidates with If-None-Match."""
+        get_user = AsyncMock(return_value=TEST_USER)
+        with patch.object(users.user_service, "get_user_by_id", get_user):
+            response = client.get("/users/me")
+
+            assert response.status_code == 200
+            assert response.json()["email"] == TEST_USER["email"]
+            get_user.assert_awaited_with(TEST_UUID)
+
+            response = client.get("/users/me", headers={"If-None-Match": response.headers["etag"]})
+
+            assert response.status_code == 304
+
+    def test_get_my_profile_missing_user(self, client):
+        """Test that a token for a deleted user returns 404."""
+        with patch.object(users.user_service, "get_user_by_id", AsyncMock(return_value=None)):
+            response = client.get("/users/me")
+
+        assert response.status_code == 404
@@ -0,0 +1,11 @@
+-- Migration: Add indexes for producer order lookups
+-- Orders are found through their items' products, then filtered and sorted
+
+-- Add index for finding a producer's products
+CREATE INDEX IF NOT EXISTS idx_products_producer_id ON public.products(producer_id);
+
+-- Add index for finding order items by product
+CREATE INDEX IF NOT EXISTS idx_order_items_product_id ON public.order_items(product_id, order_id);
+
+-- Add index for filtering orders by status and sorting by created_at
+CREATE INDEX IF NOT EXISTS idx_orders_status_fulfillment_created_at ON public.orders(status, fulfillment_status, created_at DESC);
@@ -0,0 +1,5 @@
+-- Migration: Add index for keyset pagination of users
+-- The user list is paged newest first by (created_at, id)
+
+-- Add index matching the list order, so each page is a single range scan
+CREATE INDEX IF NOT EXISTS idx_users_created_at_id ON public.users(created_at DESC, id DESC);